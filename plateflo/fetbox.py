@@ -4,7 +4,11 @@
 Serial control of PlateFlo FETbox hardware controllers.
 '''
 import logging
-from typing import Dict, List
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, List, Optional
 from . import serial_io as ser
 
 fetbox_logger = logging.getLogger('FETbox')
@@ -22,14 +26,144 @@ CMDS = {
     'anawrite':     '@B%02i%03i\n'  # analogWrite pin i
 }
 
-def scan_for_fetbox(baud:int = 115200) -> List[Dict[str, int]]:
+# Pre-encoded command templates, formatted directly to bytes for `write_cmd`
+_CMD_GET_ID = CMDS['get_id'].encode()
+_CMD_HEARTBEAT = CMDS['heartbeat'].encode()
+_CMD_ENABLE = CMDS['enable'].encode()
+_CMD_DISABLE = CMDS['disable'].encode()
+_CMD_PWM = b'@S%i%03i\n' # Zero-padded here, `CMDS` takes padded strings
+_CMD_HITHOLD = b'@V%i%03i\n'
+_CMD_DIGREAD = CMDS['digread'].encode()
+_CMD_DIGWRITE = CMDS['digwrite'].encode()
+_CMD_ANAREAD = CMDS['anaread'].encode()
+_CMD_ANAWRITE = CMDS['anawrite'].encode()
+
+# Pre-built enable/disable commands for MOSFET output channels 1-5
+FETBOX_CHANNELS = range(1, 6)
+_ENABLE_CMDS = {_chan: _CMD_ENABLE % _chan for _chan in FETBOX_CHANNELS}
+_DISABLE_CMDS = {_chan: _CMD_DISABLE % _chan for _chan in FETBOX_CHANNELS}
+
+# Friendly pin name look up table, analog pin name (A0-A7) to pin integer value
+_PIN_TABLE = {'A%i' % _pin: 14 + _pin for _pin in range(8)}
+_ANALOG_PIN_LIST = list(_PIN_TABLE)
+_ANALOG_PINS = frozenset(_ANALOG_PIN_LIST)
+# Digitally readable/writable pins [2-13, A0-A5]. A6, A7 are analog read-only
+_DIGITAL_PIN_LIST = list(range(2, 14)) + ['A%i' % _pin for _pin in range(6)]
+# Digital pin to pin integer value, None if pin not digitally readable/writable
+_DIG_RESOLVE = {_pin: _PIN_TABLE.get(_pin, _pin) for _pin in _DIGITAL_PIN_LIST}
+
+# USB vendor IDs of Arduino Nano and common USB-serial bridges (Arduino, CH340,
+# FTDI, Silicon Labs CP210x)
+FETBOX_USB_VIDS = {0x2341, 0x1A86, 0x0403, 0x10C4}
+FETBOX_USB_DESCS = ('Arduino', 'CH340', 'USB Serial')
+
+# Responses indicating a command will never succeed, retries are skipped
+_FATAL_RESPONSES = {b'!', b'ERR'}
+
+# Last `scan_for_fetbox` result, reused for repeated scans within `SCAN_TTL`
+SCAN_TTL = 1.0 # seconds
+_scan_cache = {'ts': 0.0, 'baud': None, 'expected': None, 'result': None}
+
+def _is_ack(rsp:bytes) -> bool:
     '''
-    Scans serial ports for any connected PlateFlo FETbox controllers.
+    Check for FETbox command acknowledgement, `*` terminated response.
+
+    Parameters
+    ----------
+    rsp : bytes
+        Command response string.
+
+    Returns
+    -------
+    bool
+        Command acknowledged
+    '''
+    return rsp.rstrip()[-1:] == b'*'
+
+def _backoff_sleep(attempt:int, base:float = 0.01, cap:float = 0.2):
+    '''
+    Sleep before a command retry. Exponential backoff with full jitter.
+
+    Parameters
+    ----------
+    attempt : int
+        Retry attempt number, starting from 1.
+    base : float, default=0.01
+        Backoff base delay (seconds).
+    cap : float, default=0.2
+        Maximum backoff delay (seconds).
+    '''
+    time.sleep(random.uniform(0, min(cap, base * 2**attempt)))
+
+def _candidate_ports() -> List[str]:
+    '''
+    List serial ports which may host a FETbox, based on USB VID/description.
+    Falls back to all system serial ports if no candidates are found, e.g.
+    for user-built hardware using a different USB-serial bridge.
+
+    Returns
+    -------
+    list
+        Serial port names
+    '''
+    candidates = []
+    for info in ser._comports():
+        desc = info.description or ''
+        if (info.vid in FETBOX_USB_VIDS
+                or any(_desc in desc for _desc in FETBOX_USB_DESCS)):
+            candidates.append(info.name)
+        else:
+            fetbox_logger.debug('Skipping %s (%s)', info.name, desc)
+    if not candidates:
+        return ser.list_ports()
+    return candidates
+
+def _probe_port(port:str, baud:int) -> Optional[Dict[str, int]]:
+    '''
+    Probe a single serial port for a connected FETbox.
+
+    Parameters
+    ----------
+    port : str
+        Serial port name (e.g. 'COM3').
+    baud : int
+        Serial baud rate.
+
+    Returns
+    -------
+    dict[str, int] or None
+        `port` (str) and `id` (int) of detected FETbox. None if not detected.
+    '''
+    fetbox_logger.debug('Scanning %s...', port)
+    with ser.SerialDevice(port=port, timeout=0.1, baud=baud,
+                          dtr=False) as ser_device:
+        rsp = ser_device.write_cmd(_CMD_GET_ID, EOL='\n', raw=True)['resp']
+    if rsp and b'fetbox' in rsp:
+        mod_id = int(rsp[6:])
+        fetbox_logger.info("\t\tFETbox (ID %i) detected on %s.",
+            mod_id, port)
+        return {'port':port, 'id':mod_id}
+    fetbox_logger.info("\t\t...not detected on %s", port)
+    return None
+
+def scan_for_fetbox(baud:int = 115200, force:bool = False,
+                    expected:Optional[int] = None) -> List[Dict[str, int]]:
+    '''
+    Scans serial ports for any connected PlateFlo FETbox controllers. Only
+    ports with a known Arduino/USB-serial VID or description are probed,
+    concurrently.
 
     Parameters
     ---------
     baud : int, default=115200
         Serial baud rate.
+    force : bool, default=False
+        Rescan even if a scan at the same baud completed within `SCAN_TTL`
+        seconds.
+    expected : int, optional
+        Return once this many FETboxes are detected, without waiting for the
+        remaining port probes. Probes already running finish in the
+        background.
 
     Returns
     -------
@@ -37,30 +171,37 @@ def scan_for_fetbox(baud:int = 115200) -> List[Dict[str, int]]:
         One dict per FETbox containing `port` (str) and `id` (int).
         Empty if none detected.
     '''
-    mod_port = None
-    mod_id = None
-    ports = ser.list_ports()
-    controllers = []
+    if (not force and _scan_cache['baud'] == baud
+            and _scan_cache['expected'] == expected
+            and time.monotonic() - _scan_cache['ts'] < SCAN_TTL):
+        fetbox_logger.debug('Using cached FETbox scan result')
+        return list(_scan_cache['result'])
+
+    ports = _candidate_ports()
     fetbox_logger.info('Scanning for connected FETbox(es)...')
-    for port in ports:
-        fetbox_logger.debug('Scanning %s...', port)
-        ser_device = ser.SerialDevice(port=port, timeout=0.1, baud=baud)
-        ser_device.ser.dtr = False
-        ser_device.open()
-        rsp = ser_device.write_cmd(CMDS['get_id'], EOL='\n')['resp']
+    found = {} # Detected FETboxes, keyed by port list index
+    if ports:
+        ex = ThreadPoolExecutor(max_workers=min(32, len(ports)))
+        futures = {ex.submit(_probe_port, port, baud): i
+                   for i, port in enumerate(ports)}
         try:
-            if 'fetbox' in rsp:
-                mod_id = int(rsp[6:])
-                fetbox_logger.info("\t\tFETbox (ID %i) detected.", 
-                    mod_id)
-                mod_port = port
-                controllers.append({'port':mod_port, 'id':mod_id})
-            else:
-                fetbox_logger.info("\t\t...not detected")
+            for fut in as_completed(futures):
+                res = fut.result()
+                if res is None:
+                    continue
+                found[futures[fut]] = res
+                if expected and len(found) >= expected:
+                    break
         finally:
-            ser_device.close()
-            del ser_device
-    return controllers
+            # Not waiting on probes still running, they close their own port
+            for _fut in futures:
+                _fut.cancel()
+            ex.shutdown(wait=False)
+    controllers = [found[i] for i in sorted(found)]
+
+    _scan_cache.update({'ts': time.monotonic(), 'baud': baud,
+                        'expected': expected, 'result': controllers})
+    return list(controllers)
 
 class FETbox(object):
     '''
@@ -85,7 +226,9 @@ class FETbox(object):
         Serial port name
     id : int
         Module ID number
-    pin_table: dict
+    analog_pins : frozenset
+        Analog pin names, A0-A7.
+    pin_table : dict
         Analog pin name to pin number mapping.
 
     Raises
@@ -93,41 +236,43 @@ class FETbox(object):
     ValueError
         provided serial port is not connected to a FETbox device.
     '''
+    __slots__ = ('mod_ser', 'port', 'id', '_batch_buf', '_rtt_ewma',
+                 '_rtt_samples')
+
+    # Shared pin look up tables
+    analog_pins = _ANALOG_PINS
+    pin_table = _PIN_TABLE
+
     def __init__(self, port:str, baud:int = 115200):
-        self.mod_ser = ser.SerialDevice(port, baud=baud, timeout=0.3)
-        self.mod_ser.ser.dtr = False
+        self.mod_ser = ser.SerialDevice(port, baud=baud, timeout=0.3, dtr=False)
         self.mod_ser.open()
         self.port = port
+        self._batch_buf = None # Queued `batch` commands
+        self._rtt_ewma = 0.02 # Command round-trip time (s), moving average
+        self._rtt_samples = 0
 
-        # Validate device connection
-        if not self._validate_device():
+        # Validate device connection, device ID parsed from same response
+        self.id = self._validate_device()
+        if self.id is None:
             self.mod_ser.close()
             raise ValueError( ('Device on %s is not a FETbox, or improperly' 
                                'onfigured (e.g. baud).') % self.port)
 
-        self.id = self.query_ID()
         fetbox_logger.info("%s FETbox (ID: %s) initialized",
                             port, self.id)
 
-        # Available analog pins, A0-A7
-        self.analog_pins = ['A%i' % _pin for _pin in range(8)]
-
-        # Friendly pin name look up table, string to pin interger value
-        self.pin_table = {}
-        for i, __pin in enumerate(self.analog_pins):
-            self.pin_table.update({__pin: range(14, 22)[i]})
-
-    def send_cmd(self, cmd:str, attempts:int = 3) -> bool:
+    def send_cmd(self, cmd, attempts:int = 3) -> bool:
         '''
         Send arbitrary command strings. Expect pass/fail-type response from
         FETbox. Will retry a set number of times if the command fails to
-        execute successfully. 
+        execute successfully, with randomized exponential backoff.
 
-        Used internally for all `FETbox` commands.
+        Used internally for all `FETbox` commands. Within a :meth:`batch`
+        the command is queued rather than sent, and True returned.
 
         Parameters
         ---------
-        cmd : str
+        cmd : str or bytes
             Command string, format varies depending on command.
         attempts : int, default=3
             Maximum number of retry attempts before command failure.
@@ -137,91 +282,203 @@ class FETbox(object):
         bool
             Command success/failure
         '''
+        if isinstance(cmd, str):
+            cmd = cmd.encode()
+        if self._batch_buf is not None:
+            self._batch_buf.append(cmd)
+            return True
         cmd_done = False
         retries = 0
         rsp = None
         while(retries <= attempts and not cmd_done):
+            if retries > 0:
+                _backoff_sleep(retries)
             if retries > 1:
                 fetbox_logger.warning('Resending command "%s" (%i/%i)',
-                                cmd.strip("\n\r"), retries, attempts)
+                                cmd.decode().strip("\n\r"), retries, attempts)
             elif retries > 0:
                 fetbox_logger.debug('Resending command "%s" (%i/%i)',
-                                cmd.strip("\n\r"), retries, attempts)
-            rsp = self.mod_ser.write_cmd(cmd, EOL="\n")['resp']
-            if '*' in rsp:
-                cmd_done = True
+                                cmd.decode().strip("\n\r"), retries, attempts)
+            t_start = time.monotonic()
+            rsp = self.mod_ser.write_cmd(cmd, EOL="\n", raw=True)['resp']
+            if self._unrecoverable(rsp):
+                fetbox_logger.error('%s Command "%s" failed, unrecoverable '
+                                    'response: %r', self.port,
+                                    cmd.decode().strip("\n\r"), rsp)
+                return False
+            cmd_done = _is_ack(rsp)
+            if cmd_done:
+                self._update_timeout(time.monotonic() - t_start)
             retries += 1
-        if '*' in rsp:
-            return True
-        else:
-            return False
+        return cmd_done
 
-    def send_query(self, cmd:str, attempts:int = 3) -> str:
+    def send_query(self, cmd, attempts:int = 3) -> bytes:
         '''
         Send arbitrary query string. Expects a LF-terminated response. Will
         retry a set number of times if the query fails to yield a parsable
-        response. 
+        response, with randomized exponential backoff.
         
         Used internally for all `FETbox` queries.
         
         Parameters
         ---------
-        cmd : str
+        cmd : str or bytes
             Query string
         attempts : int 
             Maximum number of retry attempts before query failure.
 
         Returns
         -------
-        str
-            Query response string.
+        bytes
+            Query response string, undecoded.
         '''
-        cmd_done = False
+        if isinstance(cmd, str):
+            cmd = cmd.encode()
         retries = 0
-        rsp = None
-        while(retries <= attempts and not cmd_done):
+        while(retries <= attempts):
+            if retries > 0:
+                _backoff_sleep(retries)
             if retries > 1:
                 fetbox_logger.warning('Resending command "%s" (%i/%i)',
-                                cmd.strip("\n\r"), retries, attempts)
+                                cmd.decode().strip("\n\r"), retries, attempts)
             elif retries > 0:
                 fetbox_logger.debug('Resending command "%s" (%i/%i)',
-                                cmd.strip("\n\r"), retries, attempts)
-            rsp = self.mod_ser.write_cmd(cmd, EOL="\n")['resp']
-
-            if rsp == None:
-                cmd_done = False
+                                cmd.decode().strip("\n\r"), retries, attempts)
+            t_start = time.monotonic()
+            rsp = self.mod_ser.write_cmd(cmd, EOL="\n", raw=True)['resp']
+            if self._unrecoverable(rsp):
+                fetbox_logger.error('%s Query "%s" failed, unrecoverable '
+                                    'response: %r', self.port,
+                                    cmd.decode().strip("\n\r"), rsp)
+                return None
+            if not rsp: # Timed out, b''
                 retries += 1
-            else:
-                cmd_done = True
-                return(rsp)
+                continue
+            self._update_timeout(time.monotonic() - t_start)
+            return rsp
         return None
 
-    def _validate_device(self) -> bool:
+    @contextmanager
+    def batch(self):
         '''
-        Validate connected device is a FETbox.
+        Context manager, queues pass/fail commands (e.g. `enable_chan`,
+        `pwm_chan`) and sends them in a single serial write on exit. Queries
+        are sent immediately. Commands which fail are retried individually.
+
+        Command methods return True while queued; the actual command results
+        are added to the yielded list on exit.
+
+        Examples
+        --------
+        >>> with fetbox.batch() as results:
+        ...     for chan in range(1, 6):
+        ...         fetbox.disable_chan(chan)
+        >>> all(results)
+        True
+        '''
+        if self._batch_buf is not None:
+            raise RuntimeError('%s FETbox batch already in progress' % self.port)
+        self._batch_buf = []
+        results = []
+        try:
+            yield results
+        except BaseException:
+            self._batch_buf = None
+            raise
+        cmds, self._batch_buf = self._batch_buf, None
+        if cmds:
+            results.extend(self._send_batch(cmds))
+
+    def _send_batch(self, cmds:List[bytes]) -> List[bool]:
+        '''
+        Send several commands in one serial write, retrying failed commands
+        individually.
+
+        Parameters
+        ----------
+        cmds : list[bytes]
+            LF-terminated command strings.
+
+        Returns
+        -------
+        list[bool]
+            Command success/failure, one per command.
+        '''
+        rsp = self.mod_ser.write_cmd(b''.join(cmds), EOL='\n',
+                                     rsp_count=len(cmds), raw=True)['resp']
+        results = [_is_ack(_rsp) for _rsp in rsp]
+        results += [False] * (len(cmds) - len(results))
+        return [ok or self.send_cmd(cmd) for cmd, ok in zip(cmds, results)]
+
+    def _update_timeout(self, rtt:float):
+        '''
+        Adapt the serial response timeout to the measured command round-trip
+        time, 4x the moving average RTT (min. 50ms). Timeout is only reduced
+        once enough round trips have been measured.
+
+        Parameters
+        ----------
+        rtt : float
+            Round-trip time (seconds) of a successful command.
+        '''
+        self._rtt_ewma = 0.8*self._rtt_ewma + 0.2*rtt
+        self._rtt_samples += 1
+        timeout = max(0.05, 4*self._rtt_ewma)
+        if timeout < self.mod_ser.timeout and self._rtt_samples < 10:
+            return
+        self.mod_ser.timeout = timeout
+
+    def _unrecoverable(self, rsp:bytes) -> bool:
+        '''
+        Check if a command response indicates a permanent failure, i.e.
+        retrying the command is pointless.
+
+        Parameters
+        ----------
+        rsp : bytes
+            Command response string.
 
         Returns
         -------
         bool
-            Device is FETbox
+            Serial port closed, or FETbox responded with an error.
         '''
-        resp = self.send_query(CMDS["get_id"])
-        if 'fetbox' in resp:
-            return True
-        return False
+        if not rsp:
+            return not self.mod_ser.ser.is_open
+        return any(fatal in rsp for fatal in _FATAL_RESPONSES)
 
-    def query_ID(self) -> int:
+    def _validate_device(self) -> Optional[int]:
+        '''
+        Validate connected device is a FETbox.
+
+        Returns
+        -------
+        int or None
+            FETbox's internal ID [0-9]. None if device is not a FETbox.
+        '''
+        resp = self.send_query(_CMD_GET_ID)
+        if resp and b'fetbox' in resp:
+            try:
+                return int(resp[6:])
+            except ValueError:
+                fetbox_logger.error("%s Bad FETbox ID response: '%s'",
+                                    self.port, resp.strip())
+        return None
+
+    def query_ID(self) -> Optional[int]:
         '''
         Get the FETbox's unique ID, as defined in firmware.
 
         Returns
         -------
-        int
-            FETbox's interntal ID [0-9]
+        int or None
+            FETbox's interntal ID [0-9], None if the query failed.
         '''
         fetbox_logger.debug("%s querying FETbox ID...", self.port)
-        rsp = self.send_query(CMDS["get_id"])
+        rsp = self.send_query(_CMD_GET_ID)
         fetbox_logger.debug("\t\t Response: %s", rsp)
+        if rsp is None:
+            return None
         return int(rsp[6:])
 
     def enable_chan(self, chan:int) -> bool:
@@ -238,8 +495,9 @@ class FETbox(object):
         bool
             Command success/failure
         '''
-        if self.send_cmd(CMDS['enable'] % chan ):
-            fetbox_logger.info('%s Enabled chan. %i', self.port, chan)
+        if self.send_cmd(_ENABLE_CMDS.get(chan) or _CMD_ENABLE % chan):
+            if fetbox_logger.isEnabledFor(logging.INFO):
+                fetbox_logger.info('%s Enabled chan. %i', self.port, chan)
             return True
         fetbox_logger.error('%s Failed to enable chan. %i', self.port, chan)
         return False
@@ -258,8 +516,9 @@ class FETbox(object):
         bool
             Command success/failure
         '''
-        if self.send_cmd(CMDS['disable'] % chan):
-            fetbox_logger.info('%s Disabled chan. %i', self.port, chan)
+        if self.send_cmd(_DISABLE_CMDS.get(chan) or _CMD_DISABLE % chan):
+            if fetbox_logger.isEnabledFor(logging.INFO):
+                fetbox_logger.info('%s Disabled chan. %i', self.port, chan)
             return True
         fetbox_logger.error('%s Failed to disable chan. %i', self.port, chan)
         return False
@@ -268,6 +527,33 @@ class FETbox(object):
         '''
         Set given FETbox output channel PWM value.
         
+        Parameters
+        ----------
+        chan : int {1-5}
+            MOSFET output channel number [1-5]
+        pwm : int {0-255}
+            8-bit PWM value.
+
+        Returns
+        -------
+        bool
+            Command success/failure
+
+        Raises
+        ------
+        ValueError
+            `pwm` outside of range 0-255
+        '''
+        if not 0 <= pwm <= 255:
+            raise ValueError("PWM `pwm` must be an integer value 0-255")
+        return self.pwm_chan_fast(chan, pwm)
+
+    def pwm_chan_fast(self, chan: int, pwm: int) -> bool:
+        '''
+        Set given FETbox output channel PWM value, without range checking.
+        `pwm` is masked to 8 bits. For trusted callers, e.g. tight control
+        loops.
+
         Parameters
         ----------
         chan : int {1-5}
@@ -280,12 +566,11 @@ class FETbox(object):
         bool
             Command success/failure
         '''
-        if(0 < pwm > 255):
-            ValueError("PWM `pwm` must be an integer value 0-255")
-        _pwm = "%03i" % pwm
-        if self.send_cmd(CMDS['pwm'] % (chan, _pwm)):
-            fetbox_logger.info('%s Channel %i PWM set to %i/255', self.port, 
-                               chan, pwm)
+        pwm &= 0xFF
+        if self.send_cmd(_CMD_PWM % (chan, pwm)):
+            if fetbox_logger.isEnabledFor(logging.INFO):
+                fetbox_logger.info('%s Channel %i PWM set to %i/255', self.port, 
+                                   chan, pwm)
             return True
         fetbox_logger.error('%s Failed to set chan. %i PWM', self.port, chan)
         return False
@@ -306,18 +591,45 @@ class FETbox(object):
         -------
         bool
             Command success/failure
+
+        Raises
+        ------
+        ValueError
+            `duty` outside of range 0.0-1.0
         '''
-        if(0 > duty > 1):
-            ValueError("Duty cycle `duty` must be a float, 0.0-1.0")
-        _pwm = "%03i" % round(duty*255)
-        if self.send_cmd(CMDS['hithold'] % (chan, _pwm)):
-            fetbox_logger.info('%s Channel %i hit-and-hold enabled', self.port,
-                               chan)
+        if not 0.0 <= duty <= 1.0:
+            raise ValueError("Duty cycle `duty` must be a float, 0.0-1.0")
+        if self.send_cmd(_CMD_HITHOLD % (chan, round(duty*255))):
+            if fetbox_logger.isEnabledFor(logging.INFO):
+                fetbox_logger.info('%s Channel %i hit-and-hold enabled', self.port,
+                                   chan)
             return True
         fetbox_logger.error('%s Failed to set chan. %i hit-and-hold', self.port,
                             chan)
         return False
 
+    def analog_read_raw(self, pin: str) -> bytes:
+        '''
+        Read analog pin value directly from Arduino, unparsed.
+
+        Parameters
+        ---------
+        pin : str {'A0','A1','A2','A3','A4','A5','A6','A7'}
+            Arduino analog pin name.
+
+        Returns
+        -------
+        bytes or None
+            Raw analog read response, e.g. b'512\\r'. None if invalid pin or
+            query error.
+        '''
+        # Sanity check, valid analog pins: A0-A7
+        if pin not in _ANALOG_PINS:
+            fetbox_logger.error("'%s' is not a valid analog pin. Enter a value from %s",
+                                pin, _ANALOG_PIN_LIST)
+            return None
+        return self.send_query(_CMD_ANAREAD % _PIN_TABLE[pin])
+
     def analog_read(self, pin: str) -> int:
         '''
         Read analog pin value directly from Arduino.
@@ -332,33 +644,60 @@ class FETbox(object):
         int or None
             10-bit analog pin reading (0-1023). None if query error.
         '''
-        
-        # Sanity check, valid analog pins: A0-A7
-        if pin not in self.analog_pins:
-            fetbox_logger.error("'%s' is not a valid analog pin. Enter a value from %s",
-                                pin, self.analog_pins)
+        # Send command, save response. None if invalid pin or query failed,
+        # both logged
+        rsp = self.analog_read_raw(pin)
+        if rsp is None:
             return None
         
-        # Send command, save response
-        cmd_string = CMDS['anaread'] % self.pin_table[pin]
-        rsp = self.send_query(cmd_string)
-        
         # Attempt to convert to integer, log error & return None if not possible
         try:
-            val = int(rsp.strip())
+            val = int(rsp)
         except ValueError:
             fetbox_logger.error("%s Bad response from analog read pin '%s': '%s'",
                                 self.port, pin, rsp.strip())
             return None
-        except TypeError:
-            fetbox_logger.error("%s No response from analog read, pin '%s'", 
-                                self.port, pin)
-            return None
         else:
-            fetbox_logger.info("%s FETbox %i analogRead. Pin %s = %i",
-            self.port, self.id, pin, val)
+            if fetbox_logger.isEnabledFor(logging.INFO):
+                fetbox_logger.info("%s FETbox %i analogRead. Pin %s = %i",
+                self.port, self.id, pin, val)
             return val
 
+    def analog_read_batch(self, pins: List[str]) -> List[Optional[int]]:
+        '''
+        Read several analog pins in a single serial round trip.
+
+        Parameters
+        ---------
+        pins : list[str] {'A0','A1','A2','A3','A4','A5','A6','A7'}
+            Arduino analog pin names.
+
+        Returns
+        -------
+        list[int or None]
+            10-bit analog pin readings (0-1023), in order of `pins`. None for
+            invalid pins or query errors.
+        '''
+        valid = [pin for pin in pins if pin in _ANALOG_PINS]
+        if len(valid) != len(pins):
+            fetbox_logger.error("%s are not valid analog pins. Enter values from %s",
+                                [pin for pin in pins if pin not in _ANALOG_PINS],
+                                _ANALOG_PIN_LIST)
+        if not valid:
+            return [None] * len(pins)
+
+        cmd_string = b''.join(_CMD_ANAREAD % _PIN_TABLE[pin] for pin in valid)
+        rsp = self.mod_ser.write_cmd(cmd_string, EOL='\n', rsp_count=len(valid),
+                                     raw=True)['resp']
+        vals = {}
+        for pin, _rsp in zip(valid, rsp):
+            try:
+                vals[pin] = int(_rsp)
+            except ValueError:
+                fetbox_logger.error("%s Bad response from analog read pin '%s': '%s'",
+                                    self.port, pin, _rsp.strip())
+        return [vals.get(pin) for pin in pins]
+
     def digital_read(self, pin) -> int:
         '''
         Read digital pin value directly from Arduino.
@@ -377,21 +716,19 @@ class FETbox(object):
             None if error
         '''
 
-        # Sanity check, valid digitally readable pin given [0-13, A0-A5]
-        # A6, A7 are analog read-only
-        digital_pins = [i for i in range(2,14)] + ['A%i' % _pin for _pin in range(6)] 
-        if pin not in digital_pins:
+        # Sanity check, valid digitally readable pin given [0-13, A0-A5], and
+        # look up analog pin number. A6, A7 are analog read-only
+        resolved = _DIG_RESOLVE.get(pin)
+        if resolved is None:
             fetbox_logger.error("'%s' is not a valid digital pin. Enter a value from %s",
-                                pin, digital_pins)
+                                pin, _DIGITAL_PIN_LIST)
             return None
 
-        # Look up analog pin if necessary
-        if type(pin) == str:
-            pin = self.pin_table[pin]
-
         # Send command, save response
-        cmd_string = CMDS['digread'] % pin
+        cmd_string = _CMD_DIGREAD % resolved
         rsp = self.send_query(cmd_string)
+        if rsp is None: # Unrecoverable, already logged by `send_query`
+            return None
 
         # Attempt to convert to integer, log error & return None if not possible
         try:
@@ -405,8 +742,9 @@ class FETbox(object):
                                 self.port, pin)
             return None
         else:
-            fetbox_logger.info("%s FETbox(%i) digitalRead: Pin %s = %i",
-            self.port, self.id, pin, val)
+            if fetbox_logger.isEnabledFor(logging.INFO):
+                fetbox_logger.info("%s FETbox(%i) digitalRead: Pin %s = %i",
+                self.port, self.id, pin, val)
             return val
 
     def analog_write(self, pin: int, pwm: int) -> bool:
@@ -434,9 +772,10 @@ class FETbox(object):
             if pin != 11:
                 fetbox_logger.warning("analogWrite used a FETbox(%i) MOSFET output (Arduino pin %i)",
                 self.id, pin)
-            fetbox_logger.info("%s FETbox(%i) analogWrite: Pin %i - %i",
-                                  self.port, self.id, pin, pwm)
-            if self.send_cmd(CMDS['anawrite'] % (pin, pwm)):
+            if fetbox_logger.isEnabledFor(logging.INFO):
+                fetbox_logger.info("%s FETbox(%i) analogWrite: Pin %i - %i",
+                                      self.port, self.id, pin, pwm)
+            if self.send_cmd(_CMD_ANAWRITE % (pin, pwm)):
                 return True
         else:
             fetbox_logger.error("'%s' is not a PWM capable pin. Enter a value from %s",
@@ -461,12 +800,12 @@ class FETbox(object):
         bool
             Command success/failure
         '''
-        # Sanity check, valid digitally readable pin given [0-13, A0-A5]
-        # A6, A7 are analog read-only
-        digital_pins = [i for i in range(2,14)] + ['A%i' % _pin for _pin in range(6)] 
-        if pin not in digital_pins:
+        # Sanity check, valid digitally readable pin given [0-13, A0-A5], and
+        # look up analog pin number. A6, A7 are analog read-only
+        resolved = _DIG_RESOLVE.get(pin)
+        if resolved is None:
             fetbox_logger.error("'%s' is not a digitalWrite-capable pin. Enter a value from %s",
-                                  pin, digital_pins)
+                                  pin, _DIGITAL_PIN_LIST)
             return False
 
         # Sanity check digitalWrite value [0-1]
@@ -475,15 +814,12 @@ class FETbox(object):
                                   val)
             return False
 
-        # Look up analog pin if necessary
-        if type(pin) == str:
-            pin = self.pin_table[pin]
-
         # Send command
-        cmd_string = CMDS['digwrite'] % (pin, val)
+        cmd_string = _CMD_DIGWRITE % (resolved, val)
         if self.send_query(cmd_string):
-            fetbox_logger.info("%s FETbox (%i) digitalWrite: Pin %s = %i",
-            self.port, self.id, pin, val)
+            if fetbox_logger.isEnabledFor(logging.INFO):
+                fetbox_logger.info("%s FETbox (%i) digitalWrite: Pin %s = %i",
+                self.port, self.id, pin, val)
             return True
         return False
 
@@ -497,8 +833,9 @@ class FETbox(object):
             Heartbeat found / ping acknowledged
         '''
 
-        if self.send_cmd(CMDS['heartbeat']):
-            fetbox_logger.debug('%s FETbox heartbeat found', self.port)
+        if self.send_cmd(_CMD_HEARTBEAT):
+            if fetbox_logger.isEnabledFor(logging.DEBUG):
+                fetbox_logger.debug('%s FETbox heartbeat found', self.port)
             return True
         return False
 
@@ -507,7 +844,8 @@ class FETbox(object):
         self.mod_ser.close()
         fetbox_logger.info('%s FETbox CLOSED', self.port)
 
-def auto_connect_fetbox(baud:int = 115200) -> Dict[int, FETbox]:
+def auto_connect_fetbox(baud:int = 115200,
+                        expected:Optional[int] = None) -> Dict[int, FETbox]:
     '''
     Automatically connect to FETbox(es).
 
@@ -515,6 +853,8 @@ def auto_connect_fetbox(baud:int = 115200) -> Dict[int, FETbox]:
     ---------
     baud : int, default=115200
         Serial baud rate.
+    expected : int, optional
+        Number of FETboxes expected, stops scanning once found.
 
     Returns
     -------
@@ -528,20 +868,25 @@ def auto_connect_fetbox(baud:int = 115200) -> Dict[int, FETbox]:
         
         Non-unique FETbox device IDs detected
     '''
-    fetboxes = {}
-    used_ids = []
-    scan_result = scan_for_fetbox(baud)
+    scan_result = scan_for_fetbox(baud, expected=expected)
     if not scan_result: raise ConnectionError('No connected FETboxes detected.')
 
-    for box in scan_result:
-        if box['id'] in used_ids:
-            raise ConnectionError(('Multiple FETboxes detected with identical ' 
-                                    'IDs. Change ID in firmware and reupload.'))
-
-        _fetbox = {box['id'] : FETbox(box['port'], baud)}
-        fetboxes.update(_fetbox)
-
-    return fetboxes
+    # Connect to all FETboxes concurrently
+    with ThreadPoolExecutor(max_workers=min(32, len(scan_result))) as ex:
+        futures = [ex.submit(FETbox, box['port'], baud) for box in scan_result]
+    connected = [fut.result() for fut in futures if fut.exception() is None]
+    errors = [fut.exception() for fut in futures if fut.exception() is not None]
+
+    if errors or len({box.id for box in connected}) != len(connected):
+        # Don't leak open ports
+        for box in connected:
+            box.kill()
+        if errors:
+            raise errors[0]
+        raise ConnectionError(('Multiple FETboxes detected with identical ' 
+                                'IDs. Change ID in firmware and reupload.'))
+
+    return {box.id: box for box in connected}
 
 # If run as standalone script, will output scan results to terminal.
 if __name__ == "__main__":
@@ -7,8 +7,17 @@ Convenience functions for control of common Ismatec Reglo Digital peristaltic
 pump functions
 '''
 
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
+import math
+import random
+import re
+from threading import Event, Lock, Thread, current_thread
+import time
+from typing import List, Optional
 from .. import serial_io as ser
 
 dig_logger = logging.getLogger("ismatecDig")
@@ -35,6 +44,73 @@ REGLO_DIG = {
     'get_run_state'   :     '%sE\r',    # Query pump, running (+) or not (-)
 }
 
+# Valid tubing inner diameters from Ismatec, mm, sorted
+TUBING_IDS = (0.13, 0.19, 0.25, 0.38, 0.44, 0.51, 0.57, 0.64, 0.76, 0.89,
+              0.95, 1.02, 1.09, 1.14, 1.22, 1.30, 1.42, 1.52, 1.65, 1.75,
+              1.85, 2.06, 2.29, 2.54, 2.79, 3.17)
+_TUBING_ID_SET = frozenset(TUBING_IDS)
+
+# Adaptive background status polling intervals, seconds
+POLL_MIN = 0.1
+POLL_MAX = 10.0
+
+# Response parsing. Responses are handled as bytes, no decoding.
+_FLOW_RE = re.compile(rb'\s*([\d.+\-eE]+)') # E.g. b'12.2mL/min\r'
+_RUN_STATES = {b'+': 1, b'-': 0}
+
+def _parse_flow(rsp_string:bytes) -> float:
+    '''Interpret a flow rate query response, see `RegloDigital.get_flow`.'''
+    m = _FLOW_RE.match(rsp_string) if rsp_string else None
+    try:
+        return float(m.group(1)) if m else -1.0
+    except ValueError:
+        return -1.0
+
+def _flow_bytes(value:float) -> bytes:
+    '''
+    Format a value for pump command strings: 3 significant digits, sent as a
+    4-digit mantissa, and the signed exponent of `value` in scientific
+    notation. E.g. 0.122 (1.22E-01) -> "0122-1". Callers scale a flow rate
+    to the value the pump expects, e.g. mL/min / 100 for the Reglo Digital
+    and mL/min * 10 for the Reglo ICC.
+
+    Same result as `format(value, "09.2E")` with the decimal point, "E" and
+    leading exponent digit removed, including half-way rounding and negative
+    values, for exponents -9..9.
+
+    Parameters
+    ----------
+    value : float
+        Value to format.
+
+    Returns
+    -------
+    bytes
+        Formatted value, ready for the command string.
+    '''
+    if value == 0:
+        return b'0000+0'
+    sign = b'-' if value < 0 else b'0'
+    # Round the exact binary value half-to-even, as `format` does
+    num, den = abs(value).as_integer_ratio()
+    exp = math.floor(math.log10(abs(value)))
+    while True:
+        shift = 2 - exp
+        if shift >= 0:
+            mant, rem = divmod(num * 10**shift, den)
+            div = den
+        else:
+            div = den * 10**-shift
+            mant, rem = divmod(num, div)
+        if 2*rem > div or (2*rem == div and mant & 1):
+            mant += 1
+        if mant >= 1000: # log10 off by one, or rounded up to next decade
+            exp += 1
+        elif mant < 100:
+            exp -= 1
+        else:
+            return b'%s%03i%+i' % (sign, mant, exp)
+
 
 class RegloDigital():
     '''
@@ -45,8 +121,22 @@ class RegloDigital():
     port : str
         Serial port on which Relgo Digital is connected. E.g. 'COM3'.
 
-    timeout : float, default=0.5
-        Time (seconds) to allow pump to respond before commands timeout/fail.
+    addr : int
+        Pump address.
+
+    poll_interval : float or None, default=None
+        Background `status` update interval (seconds), until the poller has
+        adapted to observed pump state changes. None, no background updates;
+        call `update_status` manually, or start them later with
+        `update_status_async`.
+
+    timeout : float, default=0.2
+        Serial read and write timeout (seconds). Commands to an unresponsive
+        pump fail rather than blocking.
+
+    connect : bool, default=True
+        Configure the pump and fetch its status on init. If False, init only
+        opens the serial port; call `connect` before use.
 
     Attributes
     ----------
@@ -59,12 +149,16 @@ class RegloDigital():
     addr: int
         Pump address (for e.g. serial daisy-chaining)
 
-    status : {'timestamp':datetime, 'run_state':str, 'dir':int, 'flow':float}
+    status : {'timestamp':datetime, 'ts_mono':int, 'run_state':str, 'dir':int, 'flow':float}
         Dictionary of last pump status update values
 
         `timestamp` - datetime object of last status update
+
+        `ts_mono` - `time.monotonic_ns()` of last status update, see
+        `status_age`
         
-        `run_state` - pump head state 'Running', 'Idle', or 'ERROR'
+        `run_state` - pump head state 'Running', 'Idle', 'ERROR', or
+        'DISCONNECTED' (serial port failed and could not be reopened)
 
         `dir` - pump head direction. -1 (CCW); +1 (CW); 0 (ERROR)
 
@@ -76,17 +170,94 @@ class RegloDigital():
     last_dir : int
         Last set pump head direction. CW == +1; CCW == -1; ERROR == 0.
     '''
-    def __init__(self, port:str, addr:int):
-        self.pump_ser = ser.SerialDevice(port, timeout=0.2)
+    # Command retry backoff, seconds
+    RETRY_BASE_DELAY = 0.1
+    RETRY_MAX_DELAY = 1.0
+    # Consecutive serial port failures before status reports 'DISCONNECTED'
+    DISCONNECT_THRESHOLD = 3
+    # Time to wait for the status poller to finish on `kill`, seconds
+    POLLER_JOIN_TIMEOUT = 5.0
+
+    def __init__(self, port:str, addr:int,
+                 poll_interval:Optional[float] = None, timeout:float = 0.2,
+                 connect:bool = True):
+        self.pump_ser = ser.SerialDevice(port, timeout=timeout,
+                                         write_timeout=timeout)
         self.pump_ser.open()
         self.port = port
         self.addr = addr
+        # Address-formatted, ready to write, command strings. Commands taking
+        # a value are kept as their prefix, see `_value_cmd`.
+        self._cmds = {key: cmd.replace('%s', str(addr), 1).encode()
+                      for key, cmd in REGLO_DIG.items()}
+        for key, cmd in self._cmds.items():
+            if b'%s' in cmd:
+                self._cmds[key] = cmd.split(b'%s')[0]
         self.status = None
-        self.set_mode_flowrate() # Set put speed control for mL/min
+        self._poll_hist = deque(maxlen=100) # Seconds between run state changes
+        self._last_change = time.monotonic()
+        self._poll_interval = poll_interval
+        self._poller = None
+        self._poller_stop = Event()
+        self._status_dirty = Event() # Set on commands changing pump status
+        self._reopen_lock = Lock()
+        self._killed = False # Port closed by `kill`, not reopened
+        self._consecutive_failures = 0 # Serial port failures, reset on success
+        # Flow only changes on flow/calibration commands. Cached between
+        # status updates, re-queried once marked dirty.
+        self._flow_dirty = True
+        self._cached_flow = -1.0
         self.last_dir = None # Track direction setting, no way to query
-        self.update_status()
+        if connect:
+            self.connect()
         dig_logger.debug('%s Reglo Digital device initialized', port)
 
+    def connect(self):
+        '''
+        Set the pump to mL/min mode, fetch its status, and start the
+        background status poller (if enabled). Called on init unless
+        `connect=False`.
+        '''
+        self.set_mode_flowrate() # Set put speed control for mL/min
+        self.update_status()
+        if self._poll_interval is not None:
+            self.update_status_async()
+
+    @classmethod
+    def connect_all(cls, configs:List[dict]) -> List['RegloDigital']:
+        '''
+        Initialize and connect several pumps concurrently, rather than paying
+        each pump's setup round-trips in turn.
+
+        Parameters
+        ----------
+        configs : list of dict
+            `RegloDigital` keyword arguments per pump, e.g.
+            `[{'port': 'COM3', 'addr': 1}, {'port': 'COM4', 'addr': 1}]`
+
+        Returns
+        -------
+        list of RegloDigital
+            Connected pumps, in `configs` order.
+        '''
+        if not configs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(32, len(configs))) as ex:
+            futures = [ex.submit(cls, **config) for config in configs]
+        pumps = [fut.result() for fut in futures if fut.exception() is None]
+        errors = [fut.exception() for fut in futures
+                  if fut.exception() is not None]
+        if errors:
+            # Don't leak open ports
+            for pump in pumps:
+                pump.kill()
+            raise errors[0]
+        return pumps
+
+    def _value_cmd(self, key:str, value:bytes) -> bytes:
+        '''Build command `key` with its `value`, e.g. set_flow + b"0122-1".'''
+        return self._cmds[key] + value + b'\r'
+
     def send_cmd_pass_fail(self, cmd: str) -> int:
         '''
         Send command ,`cmd`, to pump. Resend if failure up to a total of three 
@@ -98,7 +269,7 @@ class RegloDigital():
 
         Parameters
         ----------
-        cmd : str 
+        cmd : str or bytes
             Command string, CR-terminated.
 
         Returns
@@ -111,26 +282,32 @@ class RegloDigital():
             -1 == error
 
         '''
-        cmd_string = cmd #% (self.addr)
+        # Encode once, not on every retry
+        cmd_string = cmd.encode() if isinstance(cmd, str) else cmd
         cmd_done = False
         rsp_dict = ''
         tries = 0
         while not cmd_done and tries <= 3:
-            rsp_dict = self.pump_ser.write_cmd(cmd_string, 1)
+            rsp_dict = self._write(self.pump_ser.write_cmd, cmd_string, 1,
+                                   raw=True)
             rsp_string = rsp_dict['resp']
             rsp_cmd = rsp_dict['cmd']
             if rsp_cmd != cmd_string:
-                Warning('Command/response queue out of sync!')
+                dig_logger.error('%s Command/response queue out of sync! '
+                                 'cmd=%r resp=%r', self.port, cmd_string,
+                                 rsp_cmd)
                 return -1
-            if rsp_string == '*':
+            if rsp_string == b'*':
                 return 1
             tries += 1
+            if tries <= 3:
+                self._retry_sleep(tries)
 
-        if rsp_string == '#':
+        if rsp_string == b'#':
             return 0
         return -1
 
-    def send_cmd_string_resp(self, cmd) -> str:
+    def send_cmd_string_resp(self, cmd, raw:bool = False) -> str:
         '''
         Query the pump with `cmd`. Resend if failure up to a total of three 
         attempts.
@@ -141,39 +318,241 @@ class RegloDigital():
 
         Parameters
         ----------
-        cmd : str 
+        cmd : str or bytes
             Command string, CR-terminated.
+        raw : bool, default=False
+            Return the undecoded `bytes` response.
 
         Returns
         -------
-        str
+        str or bytes
             pump response string
 
         '''
         cmd_string = cmd
-        rsp_dict = self.pump_ser.write_cmd(cmd_string, EOL='\n')
-        rsp_cmd = rsp_dict['cmd']
-        if rsp_cmd != cmd_string:
-            dig_logger.error('%s Command/response queue out of sync!', self.port)
-            return None
-        return rsp_dict['resp']
+        rsp_string = ''
+        tries = 0
+        while not rsp_string and tries <= 3:
+            if tries:
+                self._retry_sleep(tries)
+            rsp_dict = self._write(self.pump_ser.write_cmd, cmd_string,
+                                   EOL='\n', raw=raw)
+            rsp_cmd = rsp_dict['cmd']
+            if rsp_cmd != cmd_string:
+                dig_logger.error('%s Command/response queue out of sync!',
+                                 self.port)
+                return None
+            rsp_string = rsp_dict['resp']
+            tries += 1
+        return rsp_string
+
+    def _retry_sleep(self, tries:int):
+        '''
+        Sleep before a command retry. Exponential backoff, capped at
+        `RETRY_MAX_DELAY`, with a little jitter so pumps sharing a USB hub
+        don't retry in lockstep.
+
+        Parameters
+        ----------
+        tries : int
+            Failed attempts so far, starting from 1.
+        '''
+        delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2**(tries-1))
+        time.sleep(delay + random.uniform(0, 0.05))
 
-    def update_status(self):
-        'Update the pump `status` attribute. Must be called manually.'
+    def _write(self, write, *args, **kwargs) -> dict:
+        '''
+        Call `write` (`pump_ser.write_cmd` or `pump_ser.write_cmd_batch`),
+        reopening the serial port and retrying, with backoff, up to three
+        times on a serial port failure, e.g. transient USB disconnect. A
+        port left closed by earlier failed reopens is reopened first.
+
+        Returns
+        -------
+        dict
+            `write` response dict, see `SerialDevice.write_cmd`.
+        '''
+        if not self.pump_ser.isOpen and not self._reopen():
+            # Still disconnected, fails fast with an error-flagged response
+            return write(*args, **kwargs)
+        rsp_dict = write(*args, **kwargs)
+        tries = 0
+        while rsp_dict.get('error') and tries < 3:
+            self._consecutive_failures += 1
+            tries += 1
+            self._retry_sleep(tries)
+            if self._reopen():
+                rsp_dict = write(*args, **kwargs)
+        if not rsp_dict.get('error'):
+            self._consecutive_failures = 0
+        return rsp_dict
+
+    def _reopen(self) -> bool:
+        '''
+        Close and reopen the pump serial port.
+
+        Returns
+        -------
+        bool
+            Port reopened successfully
+        '''
+        if self._killed:
+            return False
+        with self._reopen_lock:
+            dig_logger.warning('%s Reopening serial port', self.port)
+            self._flow_dirty = True # May have changed while disconnected
+            if self.pump_ser.isOpen:
+                self.pump_ser.close()
+            time.sleep(0.2)
+            try:
+                self.pump_ser.open()
+            except ConnectionError:
+                dig_logger.error('%s Could not reopen serial port', self.port)
+                self._consecutive_failures += 1
+                return False
+        return True
+
+    def update_status(self, force:bool = False):
+        '''
+        Update the pump `status` attribute. Called by the background status
+        poller, only needs to be called manually if `poll_interval` is None.
+
+        Flow rate is only re-queried after commands that change it (e.g.
+        `set_flow`), otherwise the last queried value is reported.
+
+        Parameters
+        ----------
+        force : bool, default=False
+            Re-query flow rate regardless, e.g. after changing it from the
+            pump front panel.
+        '''
 
         dig_logger.debug("%s status updated.", self.port)
-        self.status = {}
-        self.status['timestamp'] = datetime.now()
-        run_status = self.get_run_state()
+        status = {}
+        status['ts_mono'] = time.monotonic_ns()
+        status['timestamp'] = datetime.now()
+        if self._flow_dirty or force:
+            # Run state and flow queries go out in a single serial transaction
+            run_rsp, flow_rsp = self._write(self.pump_ser.write_cmd_batch,
+                [(self._cmds['get_run_state'], 1, None),
+                 (self._cmds['get_flow'], None, '\n')], raw=True)['resp']
+            flow = _parse_flow(flow_rsp)
+            if flow >= 0:
+                self._cached_flow = flow
+                self._flow_dirty = False
+        else:
+            run_rsp = self._write(self.pump_ser.write_cmd,
+                                  self._cmds['get_run_state'], 1,
+                                  raw=True)['resp']
+            flow = self._cached_flow
+        run_status = self._parse_run_state(run_rsp)
         if run_status == 1:
-            self.status['run_state'] = "Running"
+            status['run_state'] = "Running"
         elif run_status == 0:
-            self.status['run_state'] = "Idle"
+            status['run_state'] = "Idle"
+        elif self._consecutive_failures >= self.DISCONNECT_THRESHOLD:
+            status['run_state'] = "DISCONNECTED"
         else:
-            self.status['run_state'] = "ERROR"
+            status['run_state'] = "ERROR"
+
+        status['flow'] = flow
+        status['dir'] = self.get_dir()
 
-        self.status['flow'] = self.get_flow()
-        self.status['dir'] = self.get_dir()
+        # Track time between run state changes, for adaptive polling
+        if self.status and self.status['run_state'] != status['run_state']:
+            now = status['ts_mono'] / 1E9
+            self._poll_hist.append(now - self._last_change)
+            self._last_change = now
+        self.status = status
+
+    def get_status(self) -> dict:
+        '''
+        Get the last pump status, kept up to date by the background status
+        poller. See `status` attribute.
+
+        Returns
+        -------
+        dict
+            Last pump status update values
+        '''
+        return self.status
+
+    def status_age(self) -> Optional[float]:
+        '''
+        Time since the last status update, without touching the wall clock.
+        For control loops checking `status` freshness.
+
+        Returns
+        -------
+        float or None
+            Seconds since `status` was last updated. None if never updated,
+            e.g. with `connect=False`.
+        '''
+        if self.status is None:
+            return None
+        return (time.monotonic_ns() - self.status['ts_mono']) / 1E9
+
+    def update_status_async(self):
+        '''
+        Start background `status` updates, independent of the caller's loop.
+        Polls are scheduled where run state changes are likely, based on
+        previously observed changes, and immediately following commands that
+        change pump status (e.g. `start`, `set_flow`). Started on init if
+        `poll_interval` is given (see `connect`). Stop with
+        :meth:`stop_status_async`.
+        '''
+        if self._poller is not None:
+            return
+        self._poller_stop.clear()
+        self._poller = Thread(target=self._poller_loop, daemon=True)
+        self._poller.start()
+
+    def stop_status_async(self):
+        '''
+        Stop background `status` updates. Waits up to `POLLER_JOIN_TIMEOUT`
+        for an update in progress to finish.
+        '''
+        poller, self._poller = self._poller, None
+        if poller is None:
+            return
+        self._poller_stop.set()
+        self._status_dirty.set() # Wake poller
+        if poller is not current_thread():
+            poller.join(self.POLLER_JOIN_TIMEOUT)
+            if poller.is_alive():
+                dig_logger.warning('%s status poller did not stop within '
+                                   '%0.1fs', self.port,
+                                   self.POLLER_JOIN_TIMEOUT)
+
+    def _poller_loop(self):
+        while True:
+            self._status_dirty.wait(self._next_poll_interval())
+            self._status_dirty.clear()
+            if self._poller_stop.is_set():
+                break
+            self.update_status()
+        dig_logger.debug('%s status poller stopped', self.port)
+
+    def _next_poll_interval(self) -> float:
+        '''
+        Time until the next background status poll. Polls at the 10th
+        percentile of the observed time-between-changes distribution,
+        conditional on no change yet. Fixed `poll_interval` until 10 changes
+        have been observed.
+
+        Returns
+        -------
+        float
+            Poll delay (seconds), `POLL_MIN` to `POLL_MAX`
+        '''
+        if len(self._poll_hist) < 10:
+            return self._poll_interval or 1.0
+        elapsed = time.monotonic() - self._last_change
+        pending = sorted(dt for dt in self._poll_hist if dt > elapsed)
+        if not pending:
+            return POLL_MAX
+        target = pending[len(pending) // 10]
+        return min(POLL_MAX, max(POLL_MIN, target - elapsed))
 
     def start(self) -> int:
         '''
@@ -189,7 +568,7 @@ class RegloDigital():
             -1 == Other error
         '''
         dig_logger.debug('%s Pump "run" command sent.', self.port)
-        resp = self.send_cmd_pass_fail(REGLO_DIG['start'] % self.addr)
+        resp = self.send_cmd_pass_fail(self._cmds['start'])
         if resp == 1:
             dig_logger.info('%s Pump STARTED', self.port)
         elif resp == 0:
@@ -199,6 +578,7 @@ class RegloDigital():
                              self.port, resp)
             resp = -1
 
+        self._status_dirty.set()
         return resp
 
     def stop(self) -> int:
@@ -216,7 +596,7 @@ class RegloDigital():
         '''
         dig_logger.debug('%s Pump "stop" command sent.', self.port)
 
-        resp = self.send_cmd_pass_fail(REGLO_DIG['stop'] % self.addr)
+        resp = self.send_cmd_pass_fail(self._cmds['stop'])
 
         if resp == 1:
             dig_logger.info('%s Pump STOPPED', self.port)
@@ -227,6 +607,7 @@ class RegloDigital():
                              self.port, resp)
             resp = -1
 
+        self._status_dirty.set()
         return resp
 
     def set_flow(self, flow_rate:float) -> int:
@@ -248,20 +629,20 @@ class RegloDigital():
             -1 == Other error
         '''
         # Format flow rate for pump command string
-        flow_input = float(flow_rate)
-        flow_string = format(flow_input/100, "09.2E") # Move decimal place
-        flow_string = flow_string.replace("E", '').replace('.', '')
-        flow_string = flow_string[:5]+flow_string[6:]
-        cmd_string = REGLO_DIG['set_flow'] % (self.addr, flow_string)
+        flow_input = (flow_rate if isinstance(flow_rate, float)
+                      else float(flow_rate))
+        cmd_string = self._value_cmd('set_flow', _flow_bytes(flow_input/100))
 
-        rsp_string = self.send_cmd_string_resp(cmd_string)
+        rsp_string = self.send_cmd_string_resp(cmd_string, raw=True)
+        self._flow_dirty = True
+        self._status_dirty.set()
         try:
-            rsp_flowrate = float(rsp_string.strip('\r'))
-        except ValueError:
+            rsp_flowrate = float(rsp_string) # Surrounding whitespace ignored
+        except (ValueError, TypeError):
             rsp_flowrate = '---'
         else:
-            pcnt_diff = abs(flow_input-rsp_flowrate)/flow_input
-            if pcnt_diff < 0.1:
+            # Within 10% of requested rate
+            if abs(flow_input - rsp_flowrate) <= 0.1*flow_input:
                 dig_logger.info("%s FLOWRATE SET to %.3fmL/min",
                              self.port,
                              rsp_flowrate)
@@ -278,14 +659,9 @@ class RegloDigital():
         float
             Flow rate in mL/min. OR `-1` if an error occured.
         '''
-        cmd_string = REGLO_DIG['get_flow'] % (self.addr)
-        rsp_string = self.send_cmd_string_resp(cmd_string)
-        try:
-            rsp_flowrate = float(rsp_string.strip('\r').replace("mL/min", ""))
-        except ValueError or AttributeError:
-            rsp_flowrate = -1.0
-
-        return rsp_flowrate
+        cmd_string = self._cmds['get_flow']
+        rsp_string = self.send_cmd_string_resp(cmd_string, raw=True)
+        return _parse_flow(rsp_string)
 
 
     def get_run_state(self):
@@ -303,17 +679,21 @@ class RegloDigital():
 
            -2 == Stopped, motor overload
         '''
-        cmd_string = REGLO_DIG['get_run_state'] % self.addr
-        rsp_dict = self.pump_ser.write_cmd(cmd_string, 1)
-        rsp_string = rsp_dict['resp']
-        if '+' in rsp_string:
-            return 1
-        if '-' in rsp_string:
-            return 0
-        if rsp_string == "#": # Failure, check again
-            rsp_dict = self.pump_ser.write_cmd(REGLO_DIG['get_name'], EOL='\r')
+        cmd_string = self._cmds['get_run_state']
+        rsp_dict = self._write(self.pump_ser.write_cmd, cmd_string, 1,
+                               raw=True)
+        return self._parse_run_state(rsp_dict['resp'])
+
+    def _parse_run_state(self, rsp_string:bytes) -> int:
+        '''Interpret a run state query response, see `get_run_state`.'''
+        state = _RUN_STATES.get(rsp_string[:1])
+        if state is not None:
+            return state
+        if rsp_string == b'#': # Failure, check again
+            rsp_dict = self._write(self.pump_ser.write_cmd,
+                                   self._cmds['get_name'], EOL='\r', raw=True)
             rsp_string = rsp_dict['resp']
-            if rsp_string == '#':
+            if rsp_string == b'#':
                 # Failure again, pump probably in overload
                 return -2
         return -1
@@ -335,25 +715,30 @@ class RegloDigital():
             0 == Fail
             
             -1 == Other error
+
+        Raises
+        ------
+        ValueError
+            `direction` is not +1 or -1
         '''
-        if direction == +1:
-            log_str = 'clockwise'
-            cmd_str = REGLO_DIG['set_clockwise'] % self.addr
+        if direction == 1:
+            log_str = 'CLOCKWISE'
+            cmd_str = self._cmds['set_clockwise']
+        elif direction == -1:
+            log_str = 'COUNTER-CLOCKWISE'
+            cmd_str = self._cmds['set_counterclockwise']
         else:
-            log_str = 'counter-clockwise'
-            cmd_str = REGLO_DIG['set_counterclockwise'] % self.addr
+            raise ValueError("Invalid direction '%s', must be +1 or -1"
+                             % direction)
         rsp = self.send_cmd_pass_fail(cmd_str)
         if rsp == 1:
-            dig_logger.info('%s Pump direction set to %s', 
-                         self.port, log_str.upper())
-            if 'counter' in log_str:
-                self.last_dir = -1
-            else:
-                self.last_dir = 1
+            dig_logger.info('%s Pump direction set to %s', self.port, log_str)
+            self.last_dir = direction
         else:
             dig_logger.error('%s FAILED to set pump direction to %s',
-                          self.port, log_str.upper())
+                          self.port, log_str)
             self.last_dir = 0
+        self._status_dirty.set()
         return rsp
 
     def get_dir(self):
@@ -376,11 +761,13 @@ class RegloDigital():
 
     def set_mode_rpm(self):
         '''Change pump flow rate to RPM speed mode'''
-        return self.send_cmd_pass_fail(REGLO_DIG['set_RPM'] % self.addr)
+        self._flow_dirty = True
+        return self.send_cmd_pass_fail(self._cmds['set_RPM'])
 
     def set_mode_flowrate(self):
         '''Change pump flow rate to mL/min mode'''
-        return self.send_cmd_pass_fail(REGLO_DIG['set_mLmin'] % self.addr)
+        self._flow_dirty = True
+        return self.send_cmd_pass_fail(self._cmds['set_mLmin'])
 
     def set_tube_diameter(self, diam_mm):
         '''
@@ -404,22 +791,22 @@ class RegloDigital():
             
             -1 == Other error
         '''
-        # Valid tubing inner diameters from Ismatec
-        tubing_ids = [0.13, 0.19, 0.25, 0.38, 0.44, 0.51, 0.57, 0.64, 0.76,
-                      0.89, 0.95, 1.02, 1.09, 1.14, 1.22, 1.30, 1.42, 1.52,
-                      1.65, 1.75, 1.85, 2.06, 2.29, 2.54, 2.79, 3.17]
-
-        if diam_mm not in tubing_ids:
+        if diam_mm not in _TUBING_ID_SET:
             dig_logger.info('%s Given tubing ID "%s" is not valid, setting to '
                          'nearest valid ID...', self.port, diam_mm)
-            # Find the nearest valid tubing diameter
-            diam_mm = min(tubing_ids, key=lambda x: abs(x-diam_mm))
-
-        diam_form = '{0:04d}'.format(int(diam_mm*100))
-        cmd_str = REGLO_DIG['set_tube_id'] % (self.addr, diam_form)
-        if cmd_str == 1:
+            # Find the nearest valid tubing diameter, either side of insertion
+            i = bisect_left(TUBING_IDS, diam_mm)
+            diam_mm = min(TUBING_IDS[max(0, i-1)],
+                          TUBING_IDS[min(len(TUBING_IDS)-1, i)],
+                          key=lambda x: abs(x-diam_mm))
+
+        diam_form = b'%04i' % round(diam_mm*100)
+        cmd_str = self._value_cmd('set_tube_id', diam_form)
+        rsp = self.send_cmd_pass_fail(cmd_str)
+        self._flow_dirty = True
+        if rsp == 1:
             dig_logger.info('%s Tubing ID set to %.2fmm', self.port, diam_mm)
-        return self.send_cmd_pass_fail(cmd_str)
+        return rsp
 
     def set_cal_flow(self, flow_rate=12.4):
         '''
@@ -443,12 +830,11 @@ class RegloDigital():
         '''
         # Format flow rate for pump command string
         flow_input = float(flow_rate)
-        flow_string = format(flow_input/100, "09.2E")
-        flow_string = flow_string.replace("E", '').replace('.', '')
-        flow_string = flow_string[:5]+flow_string[6:]
-        cmd_string = REGLO_DIG['set_cal_flow'] % (self.addr, flow_string)
+        cmd_string = self._value_cmd('set_cal_flow',
+                                     _flow_bytes(flow_input/100))
 
         rsp_string = self.send_cmd_pass_fail(cmd_string)
+        self._flow_dirty = True
         return rsp_string
 
     def display_text(self, txt):
@@ -469,19 +855,24 @@ class RegloDigital():
             
             -1 == Other error
         '''
-        # Set display panel to remote control mode
-        cmd_str = REGLO_DIG['set_disp_rem'] % self.addr
-        self.send_cmd_pass_fail(cmd_str)
-
-        # Print txt to display
         disp_txt = txt
         if len(txt) > 4:
             # Truncate to first 4 chars if too long
             dig_logger.warning('"%s" is too long to display, using 1st four',
                                 disp_txt)
             disp_txt = txt[:4]
-        cmd_str = REGLO_DIG['set_display_txt'] %  (self.addr, disp_txt)
-        return self.send_cmd_pass_fail(cmd_str)
+        rem_str = self._cmds['set_disp_rem']
+        txt_str = self._value_cmd('set_display_txt', disp_txt.encode())
+
+        # Set display panel to remote control mode and print txt in a single
+        # transaction, retrying individually whichever failed
+        rem_rsp, txt_rsp = self._write(self.pump_ser.write_cmd_batch,
+            [(rem_str, 1, None), (txt_str, 1, None)], raw=True)['resp']
+        if rem_rsp == b'*' and txt_rsp == b'*':
+            return 1
+        if rem_rsp != b'*':
+            self.send_cmd_pass_fail(rem_str)
+        return self.send_cmd_pass_fail(txt_str)
 
     def restore_display(self):
         '''
@@ -498,10 +889,70 @@ class RegloDigital():
             -1 == Other error
 
         '''
-        cmd_str = REGLO_DIG['set_disp_man'] % (self.addr)
+        cmd_str = self._cmds['set_disp_man']
         return self.send_cmd_pass_fail(cmd_str)
 
     def kill(self):
         '''Kill all threads and close pump serial port'''
+        self._killed = True
+        self.stop_status_async()
         dig_logger.info('%s pump CLOSED', self.port)
-        self.pump_ser.close()
+        if self.pump_ser.isOpen:
+            self.pump_ser.close()
+
+
+def _fan_out(call, pumps:List[RegloDigital], *args) -> List:
+    '''
+    Run `call(pump, *arg)` for each pump concurrently, results in pump order.
+    Pumps must each have their own serial port.
+    '''
+    if not pumps:
+        return []
+    with ThreadPoolExecutor(max_workers=min(32, len(pumps))) as ex:
+        return list(ex.map(call, pumps, *args))
+
+def set_flows(pumps:List[RegloDigital], flow_rates:List[float]) -> List:
+    '''
+    Set flow rates on several pumps concurrently, overlapping each pump's
+    serial round-trips rather than waiting on them in turn.
+
+    Parameters
+    ----------
+    pumps : list of RegloDigital
+        Pumps to set, each on its own serial port.
+    flow_rates : list of float
+        Flow rate (mL/min) per pump, in `pumps` order.
+
+    Returns
+    -------
+    list
+        `RegloDigital.set_flow` result per pump, in `pumps` order.
+    '''
+    return _fan_out(RegloDigital.set_flow, pumps, flow_rates)
+
+def get_flows(pumps:List[RegloDigital]) -> List[float]:
+    '''
+    Query flow rates of several pumps concurrently.
+
+    Parameters
+    ----------
+    pumps : list of RegloDigital
+        Pumps to query, each on its own serial port.
+
+    Returns
+    -------
+    list of float
+        `RegloDigital.get_flow` result per pump, in `pumps` order.
+    '''
+    return _fan_out(RegloDigital.get_flow, pumps)
+
+def update_statuses(pumps:List[RegloDigital]):
+    '''
+    Update `status` of several pumps concurrently.
+
+    Parameters
+    ----------
+    pumps : list of RegloDigital
+        Pumps to update, each on its own serial port.
+    '''
+    _fan_out(RegloDigital.update_status, pumps)
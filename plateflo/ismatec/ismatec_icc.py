@@ -7,9 +7,12 @@ Convenience functions for control of common Ismatec Reglo ICC peristaltic pump
 functions.
 '''
 
+from contextlib import contextmanager
 from datetime import datetime
 import logging
+import time
 from .. import serial_io as ser
+from .ismatec_dig import _flow_bytes
 
 icc_logger = logging.getLogger("ismatecICC")
 
@@ -39,6 +42,42 @@ REGLO_ICC = {
     'set_display_txt':      '%sDA%s\r'   # [Pump Addr]DA[string (<16 char)][CR]
 }
 
+# Commands taking only the pump address, and [Channel]...[Pump Addr] commands
+_PUMP_CMDS = ('start', 'stop', 'get_run_state', 'set_RPM', 'set_mLmin',
+              'get_flow', 'set_clockwise', 'set_counterclockwise',
+              'get_direction', 'get_calmaxflow', 'set_disp_man',
+              'set_disp_rem')
+_CHAN_CMDS = ('start_chan', 'stop_chan', 'get_chan_run_state', 'get_chan_dir',
+              'set_chan_clockwise', 'set_chan_cntr_clkws')
+
+# Responses are parsed as undecoded bytes, see `SerialDevice.write_cmd` `raw`
+_DIRS = {b'J': +1, b'K': -1}
+_DIR_LABELS = {1: "CW", -1: "CCW"} # Anything else "ERR"
+
+def _parse_run_state(rsp:bytes) -> int:
+    '''Interpret a channel run state response, see `get_chan_run_state`.'''
+    if b'+' in rsp:
+        return 1
+    if b'-' in rsp:
+        return 0
+    return -1
+
+def _parse_dir(rsp:bytes) -> int:
+    '''Interpret a (channel) direction response, see `get_chan_dir`.'''
+    return _DIRS.get(rsp[:1], 0) if rsp else 0
+
+def _parse_flow(rsp:bytes) -> float:
+    '''Interpret a channel flow rate response, see `get_chan_flow`.'''
+    rsp_flowrate = None
+    try:
+        rsp_flowrate = float(rsp.split(b' ', 1)[0])/1000 # E.g. b'10.000 ml/min'
+    except ValueError:
+        rsp_flowrate = -1.0
+    except AttributeError:
+        rsp_flowrate = -1.0
+
+    return rsp_flowrate
+
 class RegloICC():
     '''
     Ismatec Reglo ICC pump object, for serial control of multi-channel pump.
@@ -67,6 +106,8 @@ class RegloICC():
 
     status : dict
         state, direction, and flow rate for all channels. Timestamp of last update.
+        See :meth:`get_status` to read it refreshed if older than
+        `STATUS_TTL`, or after a successful command changing pump state.
 
     max_flow : float
         Pump maximum flow rate (mL/min)
@@ -74,24 +115,63 @@ class RegloICC():
     n_channels : int
         Number of independant channels on Reglo ICC pump.
     '''
+    # First pass/fail attempt response timeout, seconds. Retries use `timeout`
+    FAST_TIMEOUT = 0.1
+    # Maximum age of `status` before `get_status` refreshes it, seconds
+    STATUS_TTL = 0.25
+
     def __init__(self, port, addr, channels=4, timeout=0.5):
         self.pump_ser = ser.SerialDevice(port, timeout=timeout)
         self.pump_ser.open()
         self.port = port
         self.addr = addr
         self.status = None
+        self._status_ts = None # Monotonic time of last update, None == stale
         self.n_channels = channels
+        # Pre-encoded, ready to write, command strings. Pump-wide, per-channel
+        # (indexed by channel number), and channel addressing mode (0/1). Set
+        # flow/display text commands are kept as their prefix, see
+        # `_format_flow_cmd`, so no command template is formatted per call.
+        self._cmds = {key: (REGLO_ICC[key] % addr).encode()
+                      for key in _PUMP_CMDS}
+        for key in ('set_flow', 'set_display_txt'):
+            self._cmds[key] = (REGLO_ICC[key] % (addr, '')).encode()[:-1]
+        self._chan_cmds = {key: [(REGLO_ICC[key] % (i, addr)).encode()
+                                 for i in range(channels+1)]
+                           for key in _CHAN_CMDS}
+        self._chan_cmds['get_chan_flow'] = [
+            (REGLO_ICC['get_chan_flow'] % i).encode()
+            for i in range(channels+1)]
+        self._chan_cmds['set_chan_flow'] = [
+            (REGLO_ICC['set_chan_flow'] % (i, '')).encode()[:-1]
+            for i in range(channels+1)]
+        self._mode_cmds = [(REGLO_ICC['chan_mode'] % (addr, mode)).encode()
+                           for mode in (0, 1)]
+        # Run state, direction, and flow rate queries of all channels, see
+        # `update_status`
+        self._status_cmds = []
+        for i in range(1, channels+1):
+            self._status_cmds += [
+                (self._chan_cmds['get_chan_run_state'][i], 1, None),
+                (self._chan_cmds['get_chan_dir'][i], None, '\n'),
+                (self._chan_cmds['get_chan_flow'][i], None, '\n')]
+        self.chan_mode = None # Channel addressing mode sent to pump, if known
+        self._pending_chan_mode = 0 # Mode to send before the next command
 
-        self.set_per_chan_mode(1) # Disable per-channel addressing
-        self.chan_mode = False
+        self.set_per_chan_mode(1)
         self.max_flow = self.get_max_flowrate() # For flow-rate adjustment
         self.set_mode_flowrate() # Set put speed control for mL/min
         self.update_status()
+        self.set_per_chan_mode(0) # Disable per-channel addressing
 
-    def send_cmd_pass_fail(self, cmd:str) -> int:
+    def send_cmd_pass_fail(self, cmd:str, max_tries:int=2) -> int:
         '''
-        Send command ,`cmd`, to pump. Resend if failure up to a total of three 
-        attempts.
+        Send command ,`cmd`, to pump. First attempt waits `FAST_TIMEOUT` for
+        the response, resent at the full timeout if no valid response, up to
+        a total of `max_tries` attempts. A fail response is not resent.
+        Pass/fail commands set pump state, e.g. start, flow rate, so resending
+        one the pump did act on is harmless. A late reply to the first attempt
+        is discarded before resending, see `SerialDevice.write_cmd`.
 
         See Reglo ICC manual (pp. 17-33) for command structure 
         documentation.
@@ -99,8 +179,10 @@ class RegloICC():
 
         Parameters
         ----------
-        cmd : str 
+        cmd : str or bytes
             Command string, CR-terminated.
+        max_tries : int, default=2
+            Maximum number of attempts.
 
         Returns
         -------
@@ -111,25 +193,26 @@ class RegloICC():
 
             -1 == error
         '''
-        cmd_string = cmd
-        cmd_done = False
-        rsp_dict = ''
-        tries = 0
-        while not cmd_done and tries <= 3:
-            rsp_dict = self.pump_ser.write_cmd(cmd_string, 1)
-            rsp_string = rsp_dict['resp']
-            rsp_cmd = rsp_dict['cmd']
-            if rsp_cmd != cmd_string:
-                Warning('Command/response queue out of sync!')
+        self._flush_chan_mode()
+        # First attempt only, per command, pump port shared with other threads
+        fast_timeout = min(self.FAST_TIMEOUT, self.pump_ser.timeout)
+        rsp_string = ''
+        for tries in range(max_tries):
+            rsp_dict = self.pump_ser.write_cmd(
+                cmd, 1, raw=True, timeout=fast_timeout if tries == 0 else None)
+            if rsp_dict['cmd'] != cmd:
+                icc_logger.error('%s Command/response queue out of sync!',
+                                 self.port)
                 return -1
-            if rsp_string == '*':
+            rsp_string = rsp_dict['resp']
+            if rsp_string == b'*':
                 return 1
-            tries += 1
-        if rsp_string == '#':
-            return 0
+            if rsp_string == b'#':
+                return 0 # Pump refused command, resending won't help
         return -1
 
-    def send_cmd_string_resp(self, cmd_string:str, EOL='\n') -> str:
+    def send_cmd_string_resp(self, cmd_string:str, EOL='\n',
+                             raw:bool = False) -> str:
         '''
         Command/query the pump with `cmd`. Resend if failure up to a total of 
         three attempts.
@@ -140,15 +223,18 @@ class RegloICC():
 
         Parameters
         ----------
-        cmd : str 
+        cmd : str or bytes
             Command string, CR-terminated.
+        raw : bool, default=False
+            Return the undecoded `bytes` response.
 
         Returns
         -------
-        str
+        str or bytes
             pump response string
         '''
-        rsp_dict = self.pump_ser.write_cmd(cmd_string, EOL=EOL)
+        self._flush_chan_mode()
+        rsp_dict = self.pump_ser.write_cmd(cmd_string, EOL=EOL, raw=raw)
         rsp_cmd = rsp_dict['cmd']
         if rsp_cmd != cmd_string:
             icc_logger.error('%s Command/response queue out of sync!', self.port)
@@ -164,9 +250,9 @@ class RegloICC():
         float
             Maximum pump flow rate (mL/min)
         '''
-        cmd_str = REGLO_ICC['get_calmaxflow'] % self.addr
-        rsp = self.send_cmd_string_resp(cmd_str)
-        max_flow = float(rsp.strip(' ml/min\r\n'))
+        cmd_str = self._cmds['get_calmaxflow']
+        rsp = self.send_cmd_string_resp(cmd_str, raw=True)
+        max_flow = float(rsp.split(b' ', 1)[0])
         return max_flow
 
     def start(self) -> int:
@@ -182,12 +268,12 @@ class RegloICC():
 
             -1 == error
         '''
-        if self.chan_mode:
-            self.set_per_chan_mode(0)
+        self.set_per_chan_mode(0)
 
-        start_cmd = REGLO_ICC['start'] % (self.addr)
+        start_cmd = self._cmds['start']
         rsp = self.send_cmd_pass_fail(start_cmd)
         if rsp == 1:
+            self._status_ts = None
             icc_logger.info('%s Pump STARTED.', self.port)
         return rsp
 
@@ -204,39 +290,52 @@ class RegloICC():
 
             -1 == error
         '''
-        if self.chan_mode:
-            self.set_per_chan_mode(0)
+        self.set_per_chan_mode(0)
 
-        stop_cmd = REGLO_ICC['stop'] % (self.addr)
+        stop_cmd = self._cmds['stop']
         rsp = self.send_cmd_pass_fail(stop_cmd)
 
         if rsp == 1:
+            self._status_ts = None
             icc_logger.info('%s Pump STOPPED.', self.port)
         else:
             icc_logger.info('%s FAILED to confirm pump stop!', self.port)
         return rsp
 
+    def get_status(self) -> dict:
+        '''
+        Get the pump status, see `update_status`. Refreshed first if older
+        than `STATUS_TTL`, or after a command changed the pump state.
+
+        Returns
+        -------
+        dict
+            Pump status, see `status` attribute.
+        '''
+        if self.pump_ser.isOpen and (
+                self._status_ts is None
+                or time.monotonic() - self._status_ts > self.STATUS_TTL):
+            self.update_status()
+        return self.status
+
     def update_status(self):
-        'Update the pump `status` attribute. Must be called manually.'
+        'Update the pump `status` attribute.'
         status = {}
         status['timestamp'] = datetime.now()
-        for i in range(1, self.n_channels+1):
-            chan_state = "Running" if self.get_chan_run_state(i) > 0 else "Idle"
-            chan_dir = self.get_chan_dir(i)
-            if chan_dir == 1:
-                chan_dir = "CW"
-            elif chan_dir == -1:
-                chan_dir = "CCW"
-            else:
-                chan_dir = "ERR"
-
-            chan_flow = self.get_chan_flow(i)
+        # All channel queries pipelined in a single serial transaction
+        rsps = iter(self._chan_batch(self._status_cmds))
+
+        # Responses in (run state, direction, flow) triples, per channel
+        for i, (state_rsp, dir_rsp, flow_rsp) in enumerate(
+                zip(rsps, rsps, rsps), 1):
             status[i] = {
-                'run_state': chan_state,
-                'dir': chan_dir,
-                'flow': chan_flow
+                'run_state': ("Running" if _parse_run_state(state_rsp) > 0
+                              else "Idle"),
+                'dir': _DIR_LABELS.get(_parse_dir(dir_rsp), "ERR"),
+                'flow': _parse_flow(flow_rsp)
             }
         self.status = status
+        self._status_ts = time.monotonic()
 
     def set_mode_flowrate(self):
         '''
@@ -251,7 +350,7 @@ class RegloICC():
 
             -1 == error
         '''
-        return self.send_cmd_pass_fail(REGLO_ICC['set_mLmin'] % self.addr)
+        return self.send_cmd_pass_fail(self._cmds['set_mLmin'])
 
     def set_flow(self, flow_rate:float) -> float:
         '''
@@ -267,38 +366,67 @@ class RegloICC():
 
             -1 == error
         '''
-        # Format flow rate for pump command string
         flow_input = float(flow_rate)
         if flow_input == 0:
             return -1
+        cmd_string, flow_input = self._format_flow_cmd(
+            flow_input, self._cmds['set_flow'])
+        self.set_per_chan_mode(0)
+        rsp_string = self.send_cmd_string_resp(cmd_string, raw=True)
+        rsp = self._parse_flow_resp(rsp_string, flow_input)
+        if rsp not in (0, -1):
+            self._status_ts = None
+            icc_logger.info("%s flowrate set to %.3fmL/min", self.port, rsp)
+        return rsp
+
+    def _format_flow_cmd(self, flow_input:float, prefix:bytes) -> tuple:
+        '''
+        Build a set flow command from its `prefix`, e.g. b"1f", and the flow
+        rate in uL/min as 4-digit mantissa and signed exponent. E.g. 12.2 mL/min
+        -> b"1f0122+2\r". Flow rates above the pump limit are set to 90% of
+        `max_flow`.
+
+        Returns
+        -------
+        tuple (bytes, float)
+            Command string, flow rate sent (mL/min)
+        '''
         if flow_input > self.max_flow:
             flow_input = self.max_flow*0.9
             icc_logger.info('%s Flow set above maximum, setting to max %s mL/min',
                          self.port, flow_input)
-        flow_string = format(flow_input*10, "09.2E")
-        flow_string = flow_string.replace("E", '').replace('.', '')
-        flow_string = flow_string[:5]+flow_string[6:]
-        cmd_string = REGLO_ICC['set_flow'] % (self.addr, flow_string)
-        if self.chan_mode:
-            self.set_per_chan_mode(0)
-        rsp_string = self.send_cmd_string_resp(cmd_string)
+        cmd_string = prefix + _flow_bytes(flow_input*10) + b'\r'
+        return cmd_string, flow_input
+
+    @staticmethod
+    def _parse_flow_resp(rsp_string:bytes, flow_input:float):
+        '''
+        Check the pump set flow response (uL/min) against the flow rate sent,
+        `flow_input` (mL/min).
+
+        Returns
+        -------
+        float or int
+            Flow rate set (mL/min), within 10% of `flow_input` == pass
+
+            0 == fail
+
+            -1 == error
+        '''
         try:
-            rsp_flowrate = float(rsp_string.strip('\r'))/1000
-        except ValueError:
-            rsp_flowrate = '---'
-        else:
-            pcnt_diff = abs(flow_input-rsp_flowrate)/flow_input
-            if pcnt_diff < 0.1:
-                icc_logger.info("%s flowrate set to %.3fmL/min",
-                             self.port,
-                             rsp_flowrate)
-                return rsp_flowrate # Pass
-            return 0 # Fail
-        return -1 # Something else. Bad response?
+            rsp_flowrate = float(rsp_string)/1000 # Trailing CR ignored
+        except (ValueError, TypeError):
+            return -1 # Bad/no response
+        pcnt_diff = abs(flow_input-rsp_flowrate)/abs(flow_input) if flow_input else 0
+        if pcnt_diff < 0.1:
+            return rsp_flowrate # Pass
+        return 0 # Fail
 
     def set_per_chan_mode(self, mode:int):
         '''
-        Set mode for command addressing: channel(1), pump-wide(0)
+        Set mode for command addressing: channel(1), pump-wide(0). The mode is
+        sent lazily, before the next command, and only if the pump is not
+        already in it.
         
         Parameters
         ----------
@@ -308,16 +436,91 @@ class RegloICC():
         Returns
         -------
         int
-            1 == pass
+            1 == mode queued
+        '''
+        self._pending_chan_mode = int(bool(mode))
+        return 1
+
+    def _flush_chan_mode(self) -> int:
+        '''
+        Send the pending channel addressing mode (see `set_per_chan_mode`) if
+        it differs from the mode last sent to the pump.
+
+        Returns
+        -------
+        int
+            1 == pass/already set
 
             0 == fail
 
             -1 == error
         '''
-        rsp = self.send_cmd_pass_fail(REGLO_ICC['chan_mode'] %
-                                      (self.addr, mode))
-        self.chan_mode = bool(mode)
+        mode = self._pending_chan_mode
+        if self.chan_mode is not None and bool(mode) == self.chan_mode:
+            return 1 # Already set, skip the round-trip
+        rsp = self.pump_ser.write_cmd(self._mode_cmds[mode], 1,
+                                      raw=True)['resp']
+        # Unknown on failure, resent next time
+        self.chan_mode = bool(mode) if rsp == b'*' else None
         icc_logger.debug('%s ICC channel mode set to %s', self.addr, mode)
+        if rsp == b'*':
+            return 1
+        return 0 if rsp == b'#' else -1
+
+    @contextmanager
+    def _chan_mode(self, mode:int):
+        '''
+        Context manager, run a block of commands with channel addressing
+        `mode` (see `set_per_chan_mode`), restoring the previous mode after.
+        Mode is only sent when it changes, so nested/repeated blocks are free.
+        '''
+        prev_mode = self._pending_chan_mode
+        self.set_per_chan_mode(mode)
+        try:
+            yield
+        finally:
+            self.set_per_chan_mode(prev_mode)
+
+    def _chan_batch(self, cmds:list) -> list:
+        '''
+        Send channel-addressed commands in a single serial transaction, see
+        `SerialDevice.write_cmd_batch`. The switch to channel addressing mode
+        is pipelined in the same transaction, if needed. The pump is left in
+        channel mode, the pending mode is restored before the next pump-wide
+        command (see `set_per_chan_mode`).
+
+        Parameters
+        ----------
+        cmds : list of tuple (cmd, rsp_len, EOL)
+            Commands, with response length or EOL.
+
+        Returns
+        -------
+        list
+            Undecoded `bytes` response per command in `cmds`.
+        '''
+        switch = self.chan_mode is not True
+        batch = list(cmds)
+        if switch:
+            batch.insert(0, (self._mode_cmds[1], 1, None))
+        rsps = self.pump_ser.write_cmd_batch(batch, raw=True)['resp']
+        if switch:
+            self.chan_mode = True if rsps.pop(0) == b'*' else None
+        return rsps
+
+    def _chan_pass_fail(self, cmd) -> int:
+        '''
+        Send a channel-addressed pass/fail command, pipelined with the channel
+        mode switch (see `_chan_batch`). Failures are retried as for
+        `send_cmd_pass_fail`. Cached `status` is invalidated on pass.
+        '''
+        if self._chan_batch([(cmd, 1, None)])[0] == b'*':
+            rsp = 1
+        else:
+            with self._chan_mode(1):
+                rsp = self.send_cmd_pass_fail(cmd)
+        if rsp == 1:
+            self._status_ts = None
         return rsp
 
     def set_dir(self, direction:int) -> int:
@@ -339,18 +542,19 @@ class RegloICC():
             -1 == Other error
         '''
         if direction == +1:
-            log_str = 'clockwise'
-            cmd_str = REGLO_ICC['set_clockwise'] % (self.addr)
+            log_str = 'Clockwise'
+            cmd_str = self._cmds['set_clockwise']
         elif direction == -1:
-            log_str = 'counter-clockwise'
-            cmd_str = REGLO_ICC['set_counterclockwise'] % (self.addr)
+            log_str = 'Counter-clockwise'
+            cmd_str = self._cmds['set_counterclockwise']
         rsp = self.send_cmd_pass_fail(cmd_str)
         if rsp == 1:
+            self._status_ts = None
             icc_logger.info('%s Pump direction set to %s',
-                         self.port, log_str.capitalize())
+                         self.port, log_str)
         else:
             icc_logger.error('%s FAILED to set pump direction to %s', 
-                          self.port, log_str.capitalize())
+                          self.port, log_str)
         return rsp
 
     def get_dir(self) -> int:
@@ -368,13 +572,9 @@ class RegloICC():
                 
                 0 == unknown error
         '''
-        cmd_str = REGLO_ICC['get_direction'] % self.addr
-        rsp = self.send_cmd_string_resp(cmd_str)
-        if rsp == 'J':
-            return +1
-        if rsp == 'K':
-            return -1
-        return 0
+        cmd_str = self._cmds['get_direction']
+        rsp = self.send_cmd_string_resp(cmd_str, raw=True)
+        return _parse_dir(rsp)
 
     def set_chan_dir(self, chan:int, direction:int) -> int:
         '''
@@ -396,21 +596,19 @@ class RegloICC():
             
             -1 == Other error
         '''
-        self.set_per_chan_mode(1)
         if direction == +1:
-            log_str = 'clockwise'
-            cmd_str = REGLO_ICC['set_chan_clockwise'] % (chan, self.addr)
+            log_str = 'Clockwise'
+            cmd_str = self._chan_cmds['set_chan_clockwise'][chan]
         elif direction == -1:
-            log_str = 'counter-clockwise'
-            cmd_str = REGLO_ICC['set_chan_cntr_clkws'] % (chan, self.addr)
-        rsp = self.send_cmd_pass_fail(cmd_str)
-        self.set_per_chan_mode(0)
+            log_str = 'Counter-clockwise'
+            cmd_str = self._chan_cmds['set_chan_cntr_clkws'][chan]
+        rsp = self._chan_pass_fail(cmd_str)
         if rsp == 1:
             icc_logger.info('%s Channel %i direction set to %s',
-                         self.port, chan, log_str.capitalize())
+                         self.port, chan, log_str)
         else:
             icc_logger.error('%s FAILED to set channel %i direction to %s',
-                          self.port, chan, log_str.capitalize())
+                          self.port, chan, log_str)
         return rsp
 
     def get_chan_dir(self, chan:int) -> int:
@@ -431,15 +629,9 @@ class RegloICC():
            
            0 == error
         '''
-        self.set_per_chan_mode(1)
-        cmd_str = REGLO_ICC['get_chan_dir'] % (chan, self.addr)
-        rsp = self.send_cmd_string_resp(cmd_str).strip('\r')
-        self.set_per_chan_mode(0)
-        if rsp == 'J':
-            return +1
-        if rsp == 'K':
-            return -1
-        return rsp
+        cmd_str = self._chan_cmds['get_chan_dir'][chan]
+        rsp = self._chan_batch([(cmd_str, None, '\n')])[0]
+        return _parse_dir(rsp)
 
     def get_chan_run_state(self, chan:int) -> int:
         '''Query pump channel run state. 
@@ -458,15 +650,9 @@ class RegloICC():
 
            -1 == error
         '''
-        cmd_str = REGLO_ICC['get_chan_run_state'] % (chan, self.addr)
-        self.set_per_chan_mode(1)
-        chan_state = self.pump_ser.write_cmd(cmd_str, rsp_len=1)
-        self.set_per_chan_mode(0)
-        if '+' in chan_state['resp']:
-            return 1
-        if '-' in chan_state['resp']:
-            return 0
-        return -1
+        cmd_str = self._chan_cmds['get_chan_run_state'][chan]
+        chan_state = self._chan_batch([(cmd_str, 1, None)])[0]
+        return _parse_run_state(chan_state)
 
     def start_chan(self, chan:int) -> int:
         '''
@@ -487,11 +673,8 @@ class RegloICC():
             -1 == Other error
         '''
         icc_logger.info('%s Channel %i STARTED', self.port, chan)
-        self.set_per_chan_mode(1)
-        cmd_str = REGLO_ICC['start_chan'] % (chan, self.addr)
-        rsp = self.send_cmd_pass_fail(cmd_str)
-        self.set_per_chan_mode(0)
-        return rsp
+        cmd_str = self._chan_cmds['start_chan'][chan]
+        return self._chan_pass_fail(cmd_str)
 
     def stop_chan(self, chan:int) -> int:
         '''
@@ -512,11 +695,8 @@ class RegloICC():
             -1 == Other error
         '''
         icc_logger.info('%s Channel %i STOPPED', self.port, chan)
-        self.set_per_chan_mode(1)
-        cmd_str = REGLO_ICC['stop_chan'] % (chan, self.addr)
-        rsp = self.send_cmd_pass_fail(cmd_str)
-        self.set_per_chan_mode(0)
-        return rsp
+        cmd_str = self._chan_cmds['stop_chan'][chan]
+        return self._chan_pass_fail(cmd_str)
 
     def get_chan_flow(self, chan:int) -> float:
         '''
@@ -537,19 +717,9 @@ class RegloICC():
             
             -1.0 == error
         '''
-        cmd_str = REGLO_ICC['get_chan_flow'] % (chan)
-        self.set_per_chan_mode(1)
-        rsp = self.send_cmd_string_resp(cmd_str)
-        self.set_per_chan_mode(0)
-        rsp_flowrate = None
-        try:
-            rsp_flowrate = float(rsp.strip(' ml/min\r\n'))/1000
-        except ValueError:
-            rsp_flowrate = -1.0
-        except AttributeError:
-            rsp_flowrate = -1.0
-
-        return rsp_flowrate
+        cmd_str = self._chan_cmds['get_chan_flow'][chan]
+        rsp = self._chan_batch([(cmd_str, None, '\n')])[0]
+        return _parse_flow(rsp)
 
     def set_chan_flow(self, flow_rate, chan):
         '''Set channel flow rate in mL/min.
@@ -568,35 +738,64 @@ class RegloICC():
             0 == Fail
             -1 == Error
         '''
-        # Format flow rate for pump command string
-        self.set_per_chan_mode(1)
         flow_input = float(flow_rate)
         if flow_input == 0:
             return -1
-        if flow_input > self.max_flow:
-            flow_input = self.max_flow*0.9
-            icc_logger.info('%s Flow set above maximum, setting to max %s mL/min',
-                         self.port, flow_input)
-        flow_string = format(flow_input*10, "09.2E")
-        flow_string = flow_string.replace("E", '').replace('.', '')
-        flow_string = flow_string[:5]+flow_string[6:]
-        cmd_string = REGLO_ICC['set_chan_flow'] % (chan, flow_string)
-        rsp_string = self.send_cmd_string_resp(cmd_string)
-        self.set_per_chan_mode(0)
-        try:
-            rsp_flowrate = float(rsp_string.strip('\r'))/1000
-        except ValueError:
-            rsp_flowrate = '---'
-        except AttributeError:
-            return -1
-        else:
-            pcnt_diff = abs(flow_input-rsp_flowrate)/flow_input if flow_input > 0 else 0
-            if pcnt_diff < 0.1:
+        cmd_string, flow_input = self._format_flow_cmd(
+            flow_input, self._chan_cmds['set_chan_flow'][chan])
+        rsp_string = self._chan_batch([(cmd_string, None, '\n')])[0]
+        rsp = self._parse_flow_resp(rsp_string, flow_input)
+        if rsp not in (0, -1):
+            self._status_ts = None
+            icc_logger.info("%s Channel %i flowrate set to %.3fmL/min",
+                         self.port, chan, rsp)
+        return rsp
+
+    def set_all_channel_flows(self, flows:list) -> list:
+        '''Set flow rates (mL/min) of channels 1..N in a single serial
+        transaction, see `set_chan_flow`.
+
+        Parameters
+        ----------
+        flows : list of float
+            Flow rate in mL/min per channel, starting from channel 1.
+
+        Returns
+        -------
+        list
+            Per channel, as `set_chan_flow`. Set flow rate == Pass, 0 == Fail,
+            -1 == Error. Zero flow rates are not sent and give -1.
+
+        Raises
+        ------
+        ValueError
+            if more flow rates than pump channels are given.
+        '''
+        if len(flows) > self.n_channels:
+            raise ValueError("%i flow rates given, pump has %i channels"
+                             % (len(flows), self.n_channels))
+        results = [-1] * len(flows)
+        chans, flow_inputs, cmds = [], [], []
+        for chan, flow_rate in enumerate(flows, 1):
+            flow_input = float(flow_rate)
+            if flow_input == 0:
+                continue
+            cmd_string, flow_input = self._format_flow_cmd(
+                flow_input, self._chan_cmds['set_chan_flow'][chan])
+            chans.append(chan)
+            flow_inputs.append(flow_input)
+            cmds.append((cmd_string, None, '\n'))
+        if not cmds:
+            return results
+        rsps = self._chan_batch(cmds)
+        for chan, flow_input, rsp_string in zip(chans, flow_inputs, rsps):
+            rsp = self._parse_flow_resp(rsp_string, flow_input)
+            if rsp not in (0, -1):
+                self._status_ts = None
                 icc_logger.info("%s Channel %i flowrate set to %.3fmL/min",
-                             self.port, chan, rsp_flowrate)
-                return rsp_flowrate # Pass
-            return 0 # Fail
-        return -1 # Something else. Bad response?
+                             self.port, chan, rsp)
+            results[chan-1] = rsp
+        return results
 
     def display_text(self, txt:str) -> int:
         '''
@@ -617,7 +816,7 @@ class RegloICC():
             -1 == Other error
         '''
         # Set display panel to remote control mode
-        cmd_str = REGLO_ICC['set_disp_rem'] % self.addr
+        cmd_str = self._cmds['set_disp_rem']
         self.send_cmd_pass_fail(cmd_str)
 
         # Print txt to display
@@ -626,7 +825,7 @@ class RegloICC():
             icc_logger.warning('"%s" is too long to display, using 1st 15 char',
                                 disp_txt)
             disp_txt = txt[:15]
-        cmd_str = REGLO_ICC['set_display_txt'] %  (self.addr, disp_txt)
+        cmd_str = self._cmds['set_display_txt'] + disp_txt.encode() + b'\r'
         return self.send_cmd_pass_fail(cmd_str)
 
     def restore_display(self) -> int:
@@ -643,7 +842,7 @@ class RegloICC():
             
             -1 == Other error
         '''
-        cmd_str = REGLO_ICC['set_disp_man'] % (self.addr)
+        cmd_str = self._cmds['set_disp_man']
         return self.send_cmd_pass_fail(cmd_str)
 
     def kill(self):
@@ -6,14 +6,104 @@
 Scan system serial ports for connected Ismatec Reglo peristaltic pumps.
 '''
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
+from typing import Dict, List, Optional
 from .. import serial_io as ser
 
 isma_logger = logging.getLogger('IsmatecScanner')
 
-def scan_for_pumps() -> list:
+# Probe response timeout, seconds. Allows a pump time to start replying and
+# send its full banner.
+BANNER_TIMEOUT = 0.1
+# All addresses probed in a single write, to detect any pump on the port
+PRESENCE_PROBE = ''.join('%i#\r' % i for i in range(1, 5))
+
+def _probe_device(ser_device:ser.SerialDevice,
+                  daisy_chain:bool = False) -> List[Dict]:
+    '''
+    Probe pump addresses 1-4 on an open serial device. All addresses are
+    first probed in a single write, replies carry no address, so only ports
+    that answered are then probed address by address. An address giving no,
+    or a partial, reply is probed once more. Probes use `BANNER_TIMEOUT`
+    per command, `ser_device` timeout is left unchanged.
+
+    Parameters
+    ----------
+    ser_device : SerialDevice
+        Open serial device to probe.
+    daisy_chain : bool, default=False
+        Keep probing remaining addresses after a pump is detected.
+
+    Returns
+    -------
+    list [{'pump':str, 'port':str, 'addr':int}, ...]
+        One `dict` per pump detected on the port, see `scan_for_pumps`.
+    '''
+    pumps = []
+    port = ser_device.port
+    isma_logger.debug('Scanning %s...', port)
+    rsps = ser_device.write_cmd(PRESENCE_PROBE, EOL='\n', rsp_count=4,
+                                raw=True, timeout=BANNER_TIMEOUT)['resp']
+    if not any(rsps):
+        isma_logger.debug('\t...no pump detected')
+        return pumps
+    for i in range(1, 5):
+        isma_logger.debug('\tAddress %i...', i)
+        cmd = '%i#\r' % i
+        rsp = ser_device.write_cmd(cmd, EOL='\n', raw=True,
+                                   timeout=BANNER_TIMEOUT)['resp']
+        if b'ICC' not in rsp and b'Digital' not in rsp:
+            # No/partial response, e.g. slow pump, re-probe once
+            rsp = ser_device.write_cmd(cmd, EOL='\n', raw=True,
+                                       timeout=BANNER_TIMEOUT)['resp']
+        if b'ICC' in rsp:
+            pumps.append({'pump': 'ICC',
+                          'port': port,
+                          'addr': i})
+            isma_logger.info('\t\tReglo ICC detected. Port %s; Addr %i.', 
+                            port, i)
+        elif b'Digital' in rsp:
+            pumps.append({'pump': 'Digital',
+                          'port': port,
+                          'addr': i})
+            isma_logger.info('\t\tReglo Dig. detected. Port %s; Addr %i.', 
+                            port, i)
+        else:
+            isma_logger.debug('\t\t...no pump detected')
+            continue
+        if not daisy_chain:
+            break
+    return pumps
+
+def _probe_port(port, daisy_chain:bool = False) -> List[Dict]:
+    '''
+    Probe a serial port for pumps, see `_probe_device`. A port name is opened
+    for the probe and closed after; an already open `SerialDevice` is probed
+    as-is and left open.
+    '''
+    if isinstance(port, ser.SerialDevice):
+        return _probe_device(port, daisy_chain)
+    with ser.SerialDevice(port=port, timeout=BANNER_TIMEOUT) as ser_device:
+        return _probe_device(ser_device, daisy_chain)
+
+def scan_for_pumps(daisy_chain:bool = False,
+                   ports:Optional[List] = None) -> list:
     '''
     Scans system serial ports for connected Ismatec Reglo peristaltic pumps.
+    Ports are probed concurrently. A port with no pump is cleared by a single
+    probe of all four addresses, costing one probe timeout.
+
+    Parameters
+    ----------
+    daisy_chain : bool, default=False
+        Probe all addresses on each port, for multiple daisy-chained pumps.
+        Otherwise a port's scan stops at the first pump detected.
+    ports : list of str or SerialDevice, optional
+        Serial ports to probe, default all system serial ports. Open
+        `SerialDevice` objects, e.g. kept open between rescans, are probed
+        without reopening and left open. Their shared timeout is not changed,
+        so late replies are discarded within it, see `SerialDevice.write_cmd`.
 
     Returns
     -------
@@ -26,33 +116,13 @@ def scan_for_pumps() -> list:
 
         `addr` : int - Pump internal address.
     '''
-    ports = ser.list_ports()
+    if ports is None:
+        ports = ser.list_ports()
     pumps = []
     isma_logger.info('Scanning for Ismatec pumps...')
-    for port in ports:
-        isma_logger.debug('Scanning %s...', port)
-        ser_device = ser.SerialDevice(port=port, timeout=0.1)
-        ser_device.open()
-        for i in range(1, 5):
-            isma_logger.debug('\tAddress %i...', i)
-            rsp = ser_device.write_cmd('%i#\r' % i, EOL='\n')['resp']
-            if rsp == -1:
-                isma_logger.debug('\t\t...None')
-                continue
-            if 'ICC' in rsp:
-                pumps.append({'pump': 'ICC',
-                              'port': port,
-                              'addr': i})
-                isma_logger.info('\t\tReglo ICC detected. Port %s; Addr %i.', 
-                                port, i)
-            elif 'Digital' in rsp:
-                pumps.append({'pump': 'Digital',
-                              'port': port,
-                              'addr': i})
-                isma_logger.info('\t\tReglo Dig. detected. Port %s; Addr %i.', 
-                                port, i)
-            else:
-                isma_logger.debug('\t\t...no pump detected')
-        ser_device.close()
-        del ser_device
+    if ports:
+        with ThreadPoolExecutor(max_workers=min(32, len(ports))) as ex:
+            for port_pumps in ex.map(_probe_port, ports,
+                                     [daisy_chain]*len(ports)):
+                pumps.extend(port_pumps)
     return pumps
@@ -4,30 +4,43 @@
 Scheduler for and executing PlateFlo perfusion system events.
 '''
 
+import heapq
 import logging
 from datetime import datetime, timedelta
-
-# TODO implement threaded schedule monitoring/execution
-# from threading import Thread, Lock, Event
+from threading import Condition, Event, Thread, current_thread
 
 sched_logger = logging.getLogger('scheduler')
 
 class Scheduler():
     '''
-    Event schedule handler. Schedules, monitors, and executes events
+    Event schedule handler. Schedules, monitors, and executes events. Either
+    call :meth:`monitor` from the main script loop, or run the schedule in a
+    background thread with :meth:`start`.
     
     Attributes
     ----------
     events : list
-        Unexecuted future event objects.
+        Unexecuted future events, heap (see `heapq`) of
+        (dateTime, eventID, seq, event) tuples. Next due event first. May hold
+        removed events, skipped once they reach the front.
 
     event_history : list
-        Previous triggered event objects.
+        Previous triggered events, (dateTime, eventID, seq, event) tuples.
+        `dateTime` is the scheduled time the event fired at. A recurring
+        `event` is rescheduled in place, so all of its entries share the one
+        live object, showing its next occurance.
     '''
     def __init__(self):
         self.events = []
         self.event_history = []
         self.lastID = 0  # Event ID, to reference specific event
+        self._queued = {} # eventID: live `events` entry
+        self._seq = 0 # Insertion counter, tie-break so events aren't compared
+        self._in_flight = set() # IDs of popped events whose task is running
+        # Guards the queue, notified on add/remove to wake sleeping monitors
+        self._cv = Condition()
+        self._stop = Event()
+        self._thread = None
 
     def add_event(self, event):
         '''
@@ -45,24 +58,20 @@ class Scheduler():
             :meth:`remove_event`
         '''
         _event = event
-        if not _event.eventID:
-            eventID = self.lastID + 1
-            self.lastID = eventID
-            _event.eventID = eventID
-        else:
-            eventID = _event.eventID
-
-        next_dateTime = _event.dateTime
-        self.events.append(
-            {
-                'eventID': eventID,
-                'dateTime': next_dateTime,
-                'event': _event
-            }
-        )
+        with self._cv:
+            if not _event.eventID:
+                eventID = self.lastID + 1
+                self.lastID = eventID
+                _event.eventID = eventID
+            else:
+                eventID = _event.eventID
+
+            self._seq += 1
+            entry = (_event.dateTime, eventID, self._seq, _event)
+            self._queued[eventID] = entry
+            heapq.heappush(self.events, entry)
+            self._cv.notify_all()
         sched_logger.debug('Added - %s', _event)
-        self.events = sorted(self.events,
-                                 key = lambda i: (i['dateTime'], i['eventID']))
         return _event.eventID
 
     def remove_event(self, eventID):
@@ -73,31 +82,162 @@ class Scheduler():
         ----------
         eventID : int
             Unique event identifier.
+
+        Raises
+        ------
+        KeyError
+            No queued or running event with `eventID`.
+        '''
+        with self._cv:
+            if eventID in self._in_flight:
+                # Task running, dropping the ID cancels its rescheduling
+                self._in_flight.remove(eventID)
+                sched_logger.debug('Removed - running event %s', eventID)
+                return
+            entry = self._queued.pop(eventID) # Left in `events`, skipped later
+            self._prune()
+            if len(self.events) > 2*len(self._queued) + 16:
+                self._compact()
+            self._cv.notify_all()
+        sched_logger.debug('Removed - %s', entry[3])
+
+    def _prune(self):
+        'Drop removed/superseded entries from the front of `events`.'
+        events = self.events
+        while events and self._queued.get(events[0][1]) is not events[0]:
+            heapq.heappop(events)
+
+    def _compact(self):
+        'Rebuild `events` without removed entries, O(n). `_cv` must be held.'
+        self.events[:] = [entry for entry in self.events
+                          if self._queued.get(entry[1]) is entry]
+        heapq.heapify(self.events)
+
+    def _pop_due(self):
+        '''
+        Pop the next event if due, moving it to the event history.
+
+        Returns
+        -------
+        tuple or None
+            `events` entry, None if no event due.
+        '''
+        with self._cv:
+            if not self.events or self.events[0][0] > datetime.now():
+                return None
+            queued = heapq.heappop(self.events)
+            del self._queued[queued[1]]
+            self._in_flight.add(queued[1])
+            self._prune()
+            self.event_history.append(queued)
+        return queued
+
+    def _trigger(self, queued):
         '''
-        e = next(event for event in self.events if event['eventID'] == eventID)
-        sched_logger.debug('Removed - %s' % e['event'])
-        self.events.remove(e)
+        Execute a popped event, outside the lock. Reschedules recurrances,
+        unless removed while the task ran.
+        '''
+        sched_logger.debug('Triggered - %s', queued[3])
+        recurrance = None
+        try:
+            recurrance = queued[3].trigger() # Recurring returns itself
+        finally:
+            with self._cv:
+                if queued[1] in self._in_flight: # Not removed meanwhile
+                    self._in_flight.remove(queued[1])
+                    if recurrance:
+                        self.add_event(recurrance)
+
+    def _delay(self, max_sleep=None):
+        'Seconds until the next event, `max_sleep` if none. `_cv` must be held.'
+        if not self.events:
+            return max_sleep
+        delay = (self.events[0][0] - datetime.now()).total_seconds()
+        return delay if max_sleep is None else min(delay, max_sleep)
 
     def monitor(self):
         '''
-        **Call frequently from the main script loop!**
+        **Call frequently from the main script loop!** See
+        :meth:`sleep_until_next` to wait between calls without busy-looping,
+        or :meth:`start` to monitor from a background thread instead.
 
         Checks if events are due to trigger and transfers triggered events
         to the event history.
         Reschedules recurring events if necessary.
         '''
-        if self.events:
-            queued = self.events[0]
-        else:
+        queued = self._pop_due()
+        if queued:
+            self._trigger(queued)
+
+    def sleep_until_next(self, max_sleep=0.1):
+        '''
+        Sleep until the next event is due, or at most `max_sleep` seconds.
+        Returns early if an event is added or removed, e.g. from another
+        thread.
+
+        Parameters
+        ----------
+        max_sleep : float, default=0.1
+            Maximum sleep (seconds), bounds the main loop latency. None to
+            sleep until the next event, or until one is added.
+
+        Examples
+        --------
+        >>> while True:
+        ...     sched.monitor()
+        ...     sched.sleep_until_next()
+        '''
+        with self._cv:
+            delay = self._delay(max_sleep)
+            if delay is None or delay > 0:
+                self._cv.wait(delay) # None == until add_event
+
+    def start(self):
+        '''
+        Monitor and execute events from a background (daemon) thread, until
+        :meth:`stop`. The thread sleeps until the next event is due. Event
+        tasks run on this thread.
+        '''
+        if self._thread is not None:
             return
-        if queued['dateTime'] <= datetime.now():
-            self.event_history.append(queued)
-            self.events.remove(queued)
+        self._stop = Event() # Per thread, a stopping thread keeps its own
+        self._thread = Thread(target=self._run, args=(self._stop,),
+                              daemon=True)
+        self._thread.start()
 
-            sched_logger.debug('Triggered - %s', queued['event'])
-            recurrance = queued['event'].trigger() # Recuring returns new event
-            if recurrance:
-                self.add_event(recurrance)
+    def stop(self):
+        '''
+        Stop the :meth:`start` monitoring thread, after any running task. May
+        be called from an event task, the thread then stops once it returns.
+        '''
+        if self._thread is None:
+            return
+        self._stop.set()
+        with self._cv:
+            self._cv.notify_all()
+        if current_thread() is not self._thread:
+            self._thread.join()
+        self._thread = None
+
+    def _run(self, stop):
+        'Monitoring thread loop, see `start`.'
+        sched_logger.debug('Scheduler thread started')
+        while not stop.is_set():
+            queued = self._pop_due()
+            if queued is None:
+                with self._cv:
+                    if stop.is_set():
+                        break
+                    delay = self._delay()
+                    if delay is None or delay > 0:
+                        self._cv.wait(delay) # None == until add_event
+                continue
+            try:
+                self._trigger(queued)
+            except Exception:
+                # Keep the schedule running, e.g. after a pump command error
+                sched_logger.exception('Event %s failed', queued[1])
+        sched_logger.debug('Scheduler thread stopped')
 
 class SingleEvent():
     '''
@@ -111,19 +251,22 @@ class SingleEvent():
     task : function pointer
             Function to excecute at scheduled time
 
-    args : list
+    args : tuple or list
         positional arguments, passed to task
 
     **kwargs
         keyword arguments passed to task
     
     '''
-    def __init__(self, dateTime, task, _eventID = None, args = [], **kwargs):
+    __slots__ = ('eventType', 'triggered', 'dateTime', '_task', '_taskargs',
+                 '_taskkwargs', 'eventID')
+
+    def __init__(self, dateTime, task, _eventID = None, args = (), **kwargs):
         self.eventType = "Single"
         self.triggered = False
         self.dateTime = dateTime
         self._task = task
-        self._taskargs = args
+        self._taskargs = tuple(args) # Copied, caller's list may change
         self._taskkwargs = kwargs
         self.eventID = _eventID
 
@@ -159,7 +302,7 @@ class RecurringEvent():
     delay : timedelta, optional
         Delay first occurance by this amount. Excludes `start_time`
 
-    args : list
+    args : tuple or list
         Positional arguments, passed to task
 
     **kwargs
@@ -176,8 +319,12 @@ class RecurringEvent():
         interval not of type `timedelta`
 
     '''
+    __slots__ = ('eventType', 'interval', '_task', '_start_time', '_stop_time',
+                 '_delay', 'eventID', '_taskargs', '_taskkwargs', 'dateTime',
+                 '__resched')
+
     def __init__(self, interval, task, start_time = None, stop_time = None,
-                 delay = None, _eventID = None, _resched = False, args = [], **kwargs):
+                 delay = None, _eventID = None, _resched = False, args = (), **kwargs):
         self.eventType = "Recurring"
         self.interval = interval
         self._task = task
@@ -185,7 +332,7 @@ class RecurringEvent():
         self._stop_time = stop_time
         self._delay = delay
         self.eventID = _eventID
-        self._taskargs = args
+        self._taskargs = tuple(args) # Copied, caller's list may change
         self._taskkwargs = kwargs
         self.dateTime = None
         self.__resched = _resched
@@ -198,45 +345,47 @@ class RecurringEvent():
         # Argument check
         if self._delay and self._start_time:
             raise ValueError('Enter one of "delay" OR "start_time", not both.')
+        now = datetime.now()
         
         # Simple interval
         if not (self._start_time or self._delay):
             if type(self.interval) is timedelta:
                 if self.__resched:
-                    self.dateTime = datetime.now() + self.interval
+                    self.dateTime = now + self.interval
                 else:
-                    self.dateTime = datetime.now()
+                    self.dateTime = now
             else:
                 raise TypeError("interval must be of type 'timedelta'")
 
         # Start after delay
         elif self._delay:
             if not self.__resched:
-                self.dateTime = datetime.now() + self._delay
+                self.dateTime = now + self._delay
             else:
-                self.dateTime = datetime.now() + self.interval
+                self.dateTime = now + self.interval
         
         # Start at specified time
         elif self._start_time:
-            # Handle recurrance (start_time is in the past)
-            new_start = self._start_time
-            while new_start <= datetime.now():
-                new_start += self.interval
-            self.dateTime = new_start
+            # Handle recurrance (start_time is in the past), skip to the first
+            # occurance after now
+            missed = 0
+            if self._start_time <= now:
+                missed = (now - self._start_time) // self.interval + 1
+            self.dateTime = self._start_time + missed * self.interval
 
     def trigger(self):
+        '''
+        Execute the event task. Returns the event itself, rescheduled to the
+        next occurance, or None once past `stop_time`.
+        '''
         self._task(*self._taskargs, **self._taskkwargs)
-        next_evt = RecurringEvent(self.interval, self._task, self._start_time,
-                                      self._stop_time, self._delay, 
-                                      self.eventID, True,
-                                      self._taskargs,
-                                      **self._taskkwargs)
         if self._stop_time:
-            if (datetime.now() + self.interval) < self._stop_time:
-                return next_evt
-            sched_logger.debug('recurring event (%i) ended.', self.eventID)
-            return None
-        return next_evt
+            if (datetime.now() + self.interval) >= self._stop_time:
+                sched_logger.debug('recurring event (%i) ended.', self.eventID)
+                return None
+        self.__resched = True
+        self.set_sched_dateTime()
+        return self
     
     def __str__(self):
         time_fmt = format(self.dateTime, "%Y/%m/%d %H:%M:%S:%f")
@@ -248,7 +397,7 @@ class RecurringEvent():
             msg_str += ', delay=%s' % self._delay
         return msg_str
 
-def DailyEvent(task, hh = 0, mm = 0, s = 0, args = [], **kwargs):
+def DailyEvent(task, hh = 0, mm = 0, s = 0, args = (), **kwargs):
     '''
     Wrapper around :class:`RecurringEvent` for convenient daily task execution.
 
@@ -266,7 +415,7 @@ def DailyEvent(task, hh = 0, mm = 0, s = 0, args = [], **kwargs):
     task : function pointer
         Function executed at scheduled time
 
-    args : list
+    args : tuple or list
         Add positional arguments passed to task
 
     kwargs
@@ -5,14 +5,69 @@ Basic threaded serial command/response handling, avoids blocking
 the main thread with I/O operations during operation.
 '''
 
-from queue import Queue, Empty
-from threading import Lock, Event, Thread
-from datetime import datetime
+from collections import namedtuple
+import itertools
+from queue import Empty
+from threading import Lock, Event, Semaphore, Thread
 import logging
+import time
 import serial
 from serial.tools import list_ports as ser_list_ports
 
 serialio_logger = logging.getLogger('serialIO')
+serialio_logger.addHandler(logging.NullHandler()) # Application configures output
+
+# Command queue objects, see `CmdExecThread.execution_loop`. A command, as
+# given and encoded, with EITHER its response length or (encoded) response
+# EOL, and an optional response timeout. And the request holding the
+# command(s) written together.
+_Cmd = namedtuple('_Cmd', 'cmd data resp_len resp_eol resp_count raw timeout',
+                  defaults=(None,))
+_Request = namedtuple('_Request', 'req_id cmds batch')
+_SHUTDOWN = object() # Command queue sentinel, ends `execution_loop`
+
+class _CmdRing(object):
+    '''
+    Bounded FIFO command buffer, a fixed ring of slots counted by two
+    semaphores. Lighter than `queue.Queue` for the single consumer
+    `CmdExecThread`. Producers (caller and status polling threads) only
+    share a short lock to claim the next slot.
+
+    Parameters
+    ----------
+    size : int, default=100
+        Number of slots, `put` blocks while all are filled.
+    '''
+    def __init__(self, size=100):
+        self._buf = [None] * size
+        self._size = size
+        self._head = 0 # Next slot to pop, consumer only
+        self._tail = 0 # Next slot to fill, under `_put_lock`
+        self._put_lock = Lock()
+        self._items = Semaphore(0)
+        self._slots = Semaphore(size)
+
+    def put(self, item):
+        'Append `item`, blocks while the ring is full.'
+        self._slots.acquire()
+        with self._put_lock:
+            self._buf[self._tail] = item
+            self._tail = (self._tail + 1) % self._size
+        self._items.release()
+
+    def get(self, block=True, timeout=None):
+        'Pop the oldest item, raises `queue.Empty` if none (within `timeout`).'
+        if not self._items.acquire(block, timeout):
+            raise Empty
+        item = self._buf[self._head]
+        self._buf[self._head] = None
+        self._head = (self._head + 1) % self._size
+        self._slots.release()
+        return item
+
+    def get_nowait(self):
+        'Pop the oldest item, raises `queue.Empty` if none.'
+        return self.get(block=False)
 
 class CmdExecThread(object):
     '''
@@ -25,6 +80,8 @@ class CmdExecThread(object):
     master : SerialDevice
         The SerialDevice instance over which to send/recieve serial commands.
     '''
+    MAX_DRAIN = 8 # Queued requests taken per wake, see `execution_loop`
+
     def __init__(self, master):
         if not isinstance(master, SerialDevice):
             raise TypeError('CmdExec requires type SerialDevice as master.')
@@ -34,7 +91,9 @@ class CmdExecThread(object):
         self.ser_lock = self.device.ser_lock
         self.stop_thread = Event()
         self.cmd_Q = self.device.cmd_Q
-        self.rsp_Q = self.device.rsp_Q
+        self._stale = False # Late response bytes may be waiting, see `_execute`
+        self._stale_until = 0.0 # Monotonic time a late response may arrive by
+        self._debug = False # Debug logging enabled, checked per wake
         serialio_logger.debug('%s Command queue instantiated', self.device.port)
 
     def execution_loop(self):
@@ -42,123 +101,241 @@ class CmdExecThread(object):
         Sends commands to the `Serial` device and listens for a defined
         response.
 
-        Command queue objects are dicts containing the string command and EITHER
-        a command length or command EOL character.
+        Command queue objects are `_Request` namedtuples: the request ID (see
+        `SerialDevice._transact`), the `_Cmd` command(s) to write, and whether
+        the responses are returned as a batch. Each `_Cmd` holds the command,
+        as given and as the `bytes` written, and EITHER a response length or
+        response EOL. Its `timeout`, if not None, replaces the device timeout
+        for that command's response. The loop waits
+        on the queue until the `_SHUTDOWN` sentinel is popped, see `stop`.
 
         Examples
         --------
-        {cmd: "1H", respLen: 1} # A single character response
+        _Cmd("1H", b"1H", 1, None, None, False) # A single character response
 
-        {cmd: "1#", respEOL: '\\n'} # Multiple chars, LF-terminated
+        _Cmd("1#", b"1#", None, b'\\n', None, False) # Multiple chars, LF-term.
 
+        _Cmd("1#2#", b"1#2#", None, b'\\n', 2, False) # Two LF-terminated
+        responses, returned as a list of strings. Any `resp_count` given,
+        including 1, returns a list. None returns a single response.
+
+        _Cmd(b"@#\\n", b"@#\\n", None, b'\\n', None, True) # Response
+        returned as bytes
+
+        _Request(7, [_Cmd("1E", b"1E", 1, ...), _Cmd("1f", b"1f", None, ...)],
+        True) # Commands sent in a single write, responses returned as a list
 
         '''
         serialio_logger.debug('%s Cmd exec loop started', self.device.port)
-        while not self.stop_thread.is_set():
-            # Check command buffer
-            cmd = None
-            elapsed = None
-            timeout_us = self.device.timeout*1E6
+        shutdown = False
+        while not shutdown:
+            # Wait on command buffer, take any further queued requests as well
+            req = self.cmd_Q.get()
+            if req is _SHUTDOWN:
+                break
+            reqs = [req]
+            while len(reqs) < self.MAX_DRAIN:
+                try:
+                    req = self.cmd_Q.get_nowait()
+                except Empty:
+                    break
+                if req is _SHUTDOWN:
+                    shutdown = True # After sending those already taken
+                    break
+                reqs.append(req)
+            self._debug = serialio_logger.isEnabledFor(logging.DEBUG)
+            if self._debug:
+                serialio_logger.debug('%s %d write command(s) popped',
+                                      self.device.port, len(reqs))
+
+            # Send the requests in turn under a single lock acquisition
+            self.ser_lock.acquire()
             try:
-                cmd = self.cmd_Q.get(block=True, timeout=0.01)
-            except Empty:
-                pass
-            else:
-                serialio_logger.debug('%s write command popped', self.device.port)
-
-            if cmd is not None:
-                serialio_logger.debug('%s writing command "%s"',
-                              self.device.port, repr(cmd))
-                byte_cmd = cmd['cmd'].encode()
-                keys = cmd.keys()
-                use_EOL = 'respEOL' in keys
-                use_len = 'respLen' in keys
-                timed_out = False # Flag variable for timeout on response read
-
-                if use_EOL + use_len != 1:
-                    # Verify only one of length or EOL are given
-                    raise ValueError(('Provide one of response'
-                                     'length OR end.'))
-                
-                # Clear buffer and send command to the device
-                self.ser_lock.acquire()
-                self.ser.reset_input_buffer()
-                self.ser.write(byte_cmd)
-                timeout_start = datetime.now()
-
-                # Read in expected response length, or until timed out
-                if use_len:
-                    rsp = None
-                    resp_done = False
-                    rsp_len = cmd['respLen']
-                    while not resp_done:
-                        resp = self.ser.read(rsp_len)
-                        if isinstance(resp, bytes):
-                            resp = resp.decode('utf-8')
-                            serialio_logger.debug('%s buffer read %s',
-                                            self.device.port,
-                                            repr(resp))
-                        if resp != '':
-                            resp_done = True
-
-                        elapsed = datetime.now()-timeout_start
-                        if elapsed.microseconds > timeout_us:
-                            timed_out = True
-                            resp_done = True
-                
-                # Read in until EOL character recieved, or until timed out
-                elif use_EOL:
-                    resp = ""
-                    resp_done = False
-                    while not resp_done:
-                        # Check timeout exceeded
-                        elapsed = datetime.now() - timeout_start
-                        if elapsed.microseconds > timeout_us:
-                            resp_done = True
-                            timed_out = True
-                            break
-                        if self.ser.in_waiting > 0:
-                            timeout_start = datetime.now()
-                            in_char = self.ser.read(1)
-                            in_char = in_char.decode('utf-8')
-                            # if in_char == bytes('', 'utf-8'):
-                            #     in_char = in_char.decode('utf-8')
-                            serialio_logger.debug('%s buffer read: %s',
-                                          self.device.port,
-                                          repr(in_char))
-
-                            if in_char == cmd['respEOL']:
-                                resp_done = True
-                            else:
-                                resp += in_char if isinstance(in_char, str) else in_char.decode('utf-8')
-
-                # Timed out, returned empty string(s)
-                if not resp:
-                    serialio_logger.debug('%s command %s gave no response, timed out '
-                                  'after %0.1fms', self.device.port, 
-                                  repr(cmd['cmd']), (elapsed.microseconds/1000))
-                    err_rsp = {'resp': "", 'cmd': cmd['cmd']}
-                    self.rsp_Q.put(err_rsp)
-                # Timed out, recieved partial or unexpected response
-                elif timed_out:
-                    serialio_logger.debug('%s command %s timed out before expected'
-                                  ' response recieved. Recieved: %s', 
-                                  self.device.port, repr(cmd['cmd']), 
-                                  repr(resp))
-                    err_rsp = {'resp': resp, 'cmd': cmd['cmd']}
-                    self.rsp_Q.put(err_rsp)
-                # Success
-                else:
-                    serialio_logger.debug('%s response success: %s',
-                                  self.device.port,
-                                  resp)
-                    resp_Q = {'resp': resp, 'cmd': cmd['cmd']}
-                    self.rsp_Q.put(resp_Q)
+                for req in reqs:
+                    resps, ser_error = self._execute(req)
+                    self._deliver(req, resps, ser_error)
+            finally:
                 self.ser_lock.release()
-                self.cmd_Q.task_done()
-            cmd = None
         serialio_logger.debug("%s cmd exec thread stopped.", self.device.port)
 
+    def _execute(self, req):
+        '''
+        Write request `req` and read its response(s), `ser_lock` must be held.
+
+        The input buffer is only cleared after a response timed out, the late
+        response would otherwise be read as the next one. Request/response
+        traffic leaves it empty otherwise.
+
+        Parameters
+        ----------
+        req : _Request
+            Command queue object, see `execution_loop`.
+
+        Returns
+        -------
+        tuple
+            (responses, serial port error flag)
+        '''
+        if self._debug:
+            serialio_logger.debug('%s writing command %r',
+                                  self.device.port, req)
+        # Validated and encoded by `SerialDevice.write_cmd(_batch)`
+        cmds = req.cmds
+        byte_cmd = (cmds[0].data if len(cmds) == 1
+                    else b''.join(_cmd.data for _cmd in cmds))
+        try:
+            if self._stale:
+                self._discard_stale()
+            self.ser.write(byte_cmd)
+            return [self._read_response(_cmd) for _cmd in cmds], False
+        except serial.SerialTimeoutException:
+            # Device not accepting data, return empty response(s)
+            serialio_logger.error('%s write timed out for command %r',
+                                  self.device.port, byte_cmd)
+            return _empty_resps(cmds), False
+        except serial.SerialException as e:
+            # Port failure, e.g. USB disconnect. Flag the response so the
+            # caller can reopen the port.
+            serialio_logger.error('%s serial port error on command %r: %s',
+                                  self.device.port, byte_cmd, e)
+            self._stale = True
+            return _empty_resps(cmds), True
+
+    def _discard_stale(self):
+        '''
+        Clear the input buffer of late response bytes, `ser_lock` must be held.
+        After a read with a shortened per-command timeout, first waits out the
+        device timeout, so a slow reply is discarded rather than read as the
+        next command's.
+        '''
+        wait = self._stale_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        waiting = self.ser.in_waiting
+        if waiting:
+            serialio_logger.debug('%s discarding %d stray input byte(s)',
+                                  self.device.port, waiting)
+        self.ser.reset_input_buffer()
+        self._stale = False
+
+    def _deliver(self, req, resps, error=False):
+        '''
+        Hand the response to the caller awaiting command queue object `req`,
+        see `SerialDevice._transact`.
+
+        Parameters
+        ----------
+        req : _Request
+            Command queue object, see `execution_loop`.
+        resps : list
+            Response per command in `req`.
+        error : bool, default=False
+            Serial port failed, flagged in the response.
+        '''
+        rsp = _response(req.cmds, req.batch, resps, error)
+        pending = self.device._pending.pop(req.req_id, None)
+        if pending is not None:
+            pending['rsp'] = rsp
+            pending['done'].set()
+
+    def _read_response(self, cmd):
+        '''
+        Read the response to a written command, `ser_lock` must be held.
+
+        Parameters
+        ----------
+        cmd : _Cmd
+            Command, see `execution_loop`.
+
+        Returns
+        -------
+        str, bytes, or list
+            Response, may be partial or empty if timed out.
+        '''
+        use_len = cmd.resp_len is not None
+        use_EOL = cmd.resp_eol is not None
+        raw = cmd.raw # Return undecoded bytes response
+        timed_out = False # Flag variable for timeout on response read
+        read_start = time.monotonic()
+        timeout = self.device.timeout if cmd.timeout is None else cmd.timeout
+        deadline = read_start + timeout
+        if self.ser.timeout != timeout:
+            self.ser.timeout = timeout # Per-command, or changed since opened
+
+        # Read in expected response length, or until timed out
+        if use_len:
+            resp_done = False
+            rsp_len = cmd.resp_len
+            while not resp_done:
+                resp = self.ser.read(rsp_len)
+                if isinstance(resp, bytes) and not raw:
+                    resp = resp.decode('utf-8')
+                if self._debug:
+                    serialio_logger.debug('%s buffer read %r',
+                                          self.device.port, resp)
+                if resp:
+                    resp_done = True
+                elif time.monotonic() >= deadline:
+                    timed_out = True
+                    resp_done = True
+        
+        # Read in until EOL character recieved, or until timed out. Each
+        # read_until call waits up to the timeout, repeated while data is
+        # still arriving.
+        elif use_EOL:
+            resp = b""
+            rsp_eol = cmd.resp_eol
+            rsp_count = cmd.resp_count
+            n_resps = 1 if rsp_count is None else rsp_count
+            resps = []
+            while len(resps) < n_resps:
+                chunk = self.ser.read_until(rsp_eol)
+                if self._debug:
+                    serialio_logger.debug('%s buffer read: %r',
+                                          self.device.port, chunk)
+                if not chunk:
+                    timed_out = True
+                    break
+                resp += chunk
+                if resp.endswith(rsp_eol):
+                    resps.append(resp[:-len(rsp_eol)])
+                    resp = b""
+
+            if not raw:
+                resps = [_resp.decode('utf-8') for _resp in resps]
+                resp = resp.decode('utf-8')
+
+            # Responses are returned as a list if a count was given
+            if rsp_count is not None:
+                resp = resps
+            elif resps:
+                resp = resps[0]
+
+        if timed_out:
+            # Response may still arrive, within the device timeout even if
+            # this read's was shorter
+            self._stale = True
+            self._stale_until = read_start + self.device.timeout
+        if not self._debug:
+            return resp
+
+        # Timed out, returned empty string(s)
+        if not resp:
+            serialio_logger.debug('%s command %r gave no response, timed out '
+                          'after %0.1fms', self.device.port, 
+                          cmd.cmd, (time.monotonic() - read_start)*1000)
+        # Timed out, recieved partial or unexpected response
+        elif timed_out:
+            serialio_logger.debug('%s command %r timed out before expected'
+                          ' response recieved. Recieved: %r', 
+                          self.device.port, cmd.cmd, resp)
+        # Success
+        else:
+            serialio_logger.debug('%s response success: %s',
+                          self.device.port,
+                          resp)
+        return resp
+
     def run(self):
         'Start `execution_loop` thread'
         self.stop_thread.clear()
@@ -174,14 +351,55 @@ class CmdExecThread(object):
         bool
             Running
         '''
-        return(not self.stop_thread.is_set())
+        return self.thread is not None and not self.stop_thread.is_set()
 
     def stop(self):
         'Stop/join the `execution_loop` thread.'
         serialio_logger.debug("%s stopping cmd exec loop thread", self.device.port)
         self.stop_thread.set()
+        self.cmd_Q.put(_SHUTDOWN) # Queued behind any pending commands
         self.thread.join()
         self.thread = None
+        # Fail commands left unsent, so no request waits forever
+        while True:
+            try:
+                req = self.cmd_Q.get_nowait()
+            except Empty:
+                break
+            if req is not _SHUTDOWN: # Left unread if the thread had died
+                self._deliver(req, _empty_resps(req.cmds), True)
+
+def _to_bytes(val):
+    'Command or EOL as `bytes`, encoded once when queued, not per write/read.'
+    return val.encode() if isinstance(val, str) else val
+
+def _response(cmds, batch, resps, error=False):
+    '''
+    Response dict handed back to the caller, see `SerialDevice.write_cmd`.
+
+    Parameters
+    ----------
+    cmds : list
+        Commands, `_Cmd`, of the request.
+    batch : bool
+        Return the responses as a list, see `SerialDevice.write_cmd_batch`.
+    resps : list
+        Response per command.
+    error : bool, default=False
+        Serial port failed, flagged in the response.
+    '''
+    if batch:
+        rsp = {'resp': resps, 'cmd': [_cmd.cmd for _cmd in cmds]}
+    else:
+        rsp = {'resp': resps[0], 'cmd': cmds[0].cmd}
+    if error:
+        rsp['error'] = True
+    return rsp
+
+def _empty_resps(cmds):
+    'Empty responses for commands `cmds`, see `execution_loop`.'
+    return [[] if _cmd.resp_count is not None
+            else b'' if _cmd.raw else '' for _cmd in cmds]
 
 
 class SerialDevice(object):
@@ -199,6 +417,19 @@ class SerialDevice(object):
     timeout : float, default=0.2
         Time (seconds) to allow device to respond before commands timeout/fail.
 
+    dtr : bool, default=True
+        DTR line state applied when the port is opened. False avoids e.g.
+        Arduino auto-reset on connection.
+
+    write_timeout : float or None, default=None
+        Time (seconds) to allow a command write to block, e.g. on a full or
+        unplugged USB-serial device. Timed out writes return an empty
+        response. None blocks indefinitely.
+
+    low_latency : bool, default=True
+        Request low latency mode from the USB-serial driver when the port is
+        opened, see `set_low_latency`.
+
     Attributes
     ----------
     port : str
@@ -212,62 +443,137 @@ class SerialDevice(object):
     
     isOpen : bool
         Serial device connection open.
+
+    Examples
+    --------
+    Port is opened/closed when used as a context manager
+
+    >>> with SerialDevice('COM4') as dev:
+    ...     rsp = dev.write_cmd('1#\\r', EOL='\\n')
     '''
-    def __init__(self, port, baud=9600, timeout=0.2):
+    # Response wait bound, see `_transact`: `timeout` per expected response,
+    # plus one for a late response drain, plus `write_timeout`, times the
+    # factor, plus the margin (seconds).
+    # Leaves room for requests queued ahead by other threads.
+    RESPONSE_WAIT_FACTOR = 4
+    RESPONSE_WAIT_MARGIN = 1.0
+
+    def __init__(self, port, baud=9600, timeout=0.2, dtr=True,
+                 write_timeout=None, low_latency=True):
         self.baud = baud
         self.port = port
         self.timeout = timeout
-        self.ser = serial.Serial(port=None, baudrate=baud)
+        self.low_latency = low_latency
+        self.ser = serial.Serial(port=None, baudrate=baud,
+                                 write_timeout=write_timeout)
+        self.ser.dtr = dtr # Set before open, applied as port is opened
         self.ser_lock = Lock()
-        self.cmd_Q = Queue(maxsize=100)
-        self.rsp_Q = Queue(maxsize=100)
+        self.cmd_Q = _CmdRing(100)
+        # Request ID: {'done': Event, 'rsp': dict}, awaiting a response
+        self._pending = {}
+        self._req_ids = itertools.count(1)
         self.cmd_thread = CmdExecThread(self)
         self.isOpen = False
-        serialio_logger.debug('Serial device initialized on %s' % port)
+        serialio_logger.debug('Serial device initialized on %s', port)
 
     def open(self):
         'Open the device serial port'
-        self.ser_lock.acquire()
-        self.ser.port = self.port
-        self.ser.timeout = self.timeout
-        try:
-            self.ser.open()
-        except serial.SerialException:
-            raise ConnectionError('Could not open port %s' % self.port)
-        self.ser_lock.release()
+        with self.ser_lock:
+            self.ser.port = self.port
+            self.ser.timeout = self.timeout
+            try:
+                self.ser.open()
+                self.ser.reset_input_buffer() # Bytes from before opening
+                if self.low_latency:
+                    self.set_low_latency()
+            except serial.SerialException:
+                raise ConnectionError('Could not open port %s' % self.port)
         self.cmd_thread.run()
         self.isOpen = True
 
+    def set_low_latency(self, enable=True) -> bool:
+        '''
+        Set the USB-serial driver low latency mode (Linux only). Short device
+        responses are then passed on immediately, instead of held for the
+        driver latency timer (16 ms default on FTDI chips).
+
+        Parameters
+        ----------
+        enable : bool, default=True
+            Enable (True) or disable (False) low latency mode.
+
+        Returns
+        -------
+        bool
+            True if the mode was set. False if the platform or port does not
+            support it, the port is then left unchanged.
+        '''
+        set_mode = getattr(self.ser, 'set_low_latency_mode', None)
+        if set_mode is None:
+            return False # Not provided by pyserial on this platform
+        try:
+            set_mode(enable)
+        except (OSError, ValueError, NotImplementedError) as err:
+            serialio_logger.debug('%s low latency mode unavailable: %s',
+                                  self.port, err)
+            return False
+        return True
+
     def close(self):
         'Close the device serial port'
-        serialio_logger.debug('%s CLOSING. acquiring lock', self.port)
-        self.ser_lock.acquire()
+        # Stopped first, without the lock, the thread may be waiting on it to
+        # send commands already popped.
         serialio_logger.debug('%s CLOSING. Stopping thread', self.port)
         self.cmd_thread.stop()
         serialio_logger.debug('%s CLOSING. Closing serial', self.port)
-        self.ser.close()
-        self.ser_lock.release()
+        with self.ser_lock:
+            self.ser.close()
         self.isOpen = False
         serialio_logger.debug('%s CLOSED.', self.port)
 
-    def write_cmd(self, cmd, rsp_len=None, EOL=None):
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_cmd(self, cmd, rsp_len=None, EOL=None, rsp_count=None,
+                  raw=False, timeout=None):
         r'''
         Send command to serial device, expect either a defined response length
         (`rsp_len`) **--OR--** a terminating character (`EOL`).
 
         Parameters
         ----------
-        cmd : str
-            String to send to serial device.
+        cmd : str or bytes
+            String to send to serial device. `bytes` are written as-is.
         rsp_len : int
             Number of characters to expect in response.
         EOL : str
             Expected response terminating character (E.g. LF or CR)
+        rsp_count : int, optional
+            Number of `EOL`-terminated responses to expect, e.g. for several
+            concatenated commands. If given, even as 1, the responses are
+            returned as a list.
+        raw : bool, default=False
+            Return the response as undecoded `bytes`.
+        timeout : float, optional
+            Response timeout (seconds) for this command only, rather than
+            `timeout`. A reply arriving late, within `timeout`, is discarded
+            before the next command is written.
 
         Returns
         -------
-        str
-            Device response string. Empty string in case of response timeout.
+        dict {'resp': str, bytes, or list, 'cmd': str or bytes}
+            `resp` : Device response string, `bytes` if `raw`. Empty string
+            in case of response timeout. With `rsp_count`, a list of the
+            responses received, shorter than `rsp_count` if timed out.
+
+            `cmd` : The command, as given.
+
+            `error` : True, only present if the serial port failed, e.g. USB
+            disconnect, and should be reopened.
 
         Raises
         ------
@@ -281,36 +587,118 @@ class SerialDevice(object):
         if use_eol + use_len != 1:
             raise ValueError('Please one of EITHER rsp_len or EOL')
 
-        cmd_dict = {'cmd': cmd, 'respEOL': EOL} if use_eol else {'cmd': cmd,
-                                                            'respLen': rsp_len}
-        # cmd_dict = {'cmd': cmd, 'respLen': rsp_len}
-        self.cmd_Q.put(cmd_dict)
-        self.cmd_Q.join()
-        rsp = None
-
-        try:
-            rsp = self.rsp_Q.get(True, self.timeout*1.1)
-        except TimeoutError:
-            serialio_logger.warning("%s response Q timed out!", self.port)
+        if use_eol:
+            _cmd = _Cmd(cmd, _to_bytes(cmd), None, _to_bytes(EOL),
+                        rsp_count, raw, timeout)
         else:
-            self.rsp_Q.task_done()
+            _cmd = _Cmd(cmd, _to_bytes(cmd), rsp_len, None, None, raw,
+                        timeout)
+        return self._transact([_cmd])
+
+    def write_cmd_batch(self, cmds, raw=False):
+        r'''
+        Send several commands in a single serial write, then read back each
+        command's response in order. Each command expects either a defined
+        response length **--OR--** a terminating character, as `write_cmd`.
 
-        if rsp == 'timeout':
-            return ""
-        return rsp
+        Parameters
+        ----------
+        cmds : list of tuple (cmd, rsp_len, EOL)
+            Commands, with `rsp_len` or `EOL` given and the other None. E.g.
+            `[('1E\r', 1, None), ('1f\r', None, '\n')]`
+        raw : bool, default=False
+            Return undecoded `bytes` responses.
+
+        Returns
+        -------
+        dict {'resp': list, 'cmd': list}
+            Response per command, in order. Empty string for timed out
+            responses, identifying the command(s) to retry. `'error': True`
+            entry on serial port failure, as for `write_cmd`.
 
-def list_ports():
+        Raises
+        ------
+        ValueError
+            if both or neither of `rsp_len` and `EOL` are given for a command
+        '''
+        batch = []
+        for cmd, rsp_len, EOL in cmds:
+            if (rsp_len is not None) + (EOL is not None) != 1:
+                raise ValueError('Please one of EITHER rsp_len or EOL')
+            data = _to_bytes(cmd)
+            batch.append(_Cmd(cmd, data, None, _to_bytes(EOL), None, raw)
+                         if EOL is not None
+                         else _Cmd(cmd, data, rsp_len, None, None, raw))
+        return self._transact(batch, batch=True)
+
+    def _transact(self, cmds, batch=False):
+        '''
+        Queue commands, list of `_Cmd`, for execution and wait for the
+        response. The request is tagged with an ID, the response is handed
+        back to this request only, so several threads can queue commands at
+        once. `batch` returns the responses as a list.
+
+        Fails fast, with an error-flagged empty response, if the port is
+        closed, e.g. after a failed reopen, as nothing would execute it. The
+        wait is bounded by the response timeouts, see `RESPONSE_WAIT_FACTOR`,
+        the same error response is returned if nothing answered in time,
+        e.g. the command thread died.
+        '''
+        if not self.isOpen or not self.cmd_thread.is_running():
+            serialio_logger.error('%s port not open, command(s) %r not sent',
+                                  self.port, [_cmd.cmd for _cmd in cmds])
+            return _response(cmds, batch, _empty_resps(cmds), True)
+        req_id = next(self._req_ids)
+        pending = {'done': Event(), 'rsp': None}
+        self._pending[req_id] = pending
+        self.cmd_Q.put(_Request(req_id, cmds, batch))
+        read_time = sum((self.timeout if _cmd.timeout is None else _cmd.timeout)
+                        * (_cmd.resp_count or 1) for _cmd in cmds)
+        max_wait = ((self.timeout + read_time + (self.ser.write_timeout or 0))
+                    * self.RESPONSE_WAIT_FACTOR + self.RESPONSE_WAIT_MARGIN)
+        if not pending['done'].wait(max_wait):
+            self._pending.pop(req_id, None) # Late response is dropped
+            serialio_logger.error('%s no response to command(s) %r within '
+                                  '%0.1fs', self.port,
+                                  [_cmd.cmd for _cmd in cmds], max_wait)
+            return _response(cmds, batch, _empty_resps(cmds), True)
+        return pending['rsp']
+
+_PORTS_TTL = 0.5 # s, port enumeration reused within, see `list_ports`
+_ports_cache = (None, 0.0) # (port infos, monotonic time enumerated)
+
+def _comports(force=False):
+    '''
+    System serial port infos, `serial.tools.list_ports.comports`. Enumeration
+    is slow on some platforms (WMI on Windows), the result is reused for
+    `_PORTS_TTL` seconds unless `force`.
+    '''
+    global _ports_cache
+    infos, enum_time = _ports_cache
+    now = time.monotonic()
+    if force or infos is None or now - enum_time >= _PORTS_TTL:
+        infos = ser_list_ports.comports()
+        _ports_cache = (infos, now)
+    return infos
+
+def list_ports(force=False):
     '''
     List available system serial ports.
 
+    Parameters
+    ----------
+    force : bool, default=False
+        Enumerate the ports again, rather than reusing a result from the
+        last 0.5 s.
+
     Returns
     -------
     list
         Serial port names
     '''
 
-    ports_infos = ser_list_ports.comports()
+    ports_infos = _comports(force)
 
     port_names = [i.name for i in ports_infos]
 
-    return port_names
\ No newline at end of file
+    return port_names
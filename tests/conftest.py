@@ -0,0 +1,194 @@
+'''
+Shared test fixtures. Serial ports are replaced by `FakeSerial`, answering
+writes from a simulated device registered per port name.
+'''
+import re
+import threading
+import time
+
+import pytest
+import serial
+
+
+class FakeSerial(object):
+    'In-memory stand-in for `serial.Serial`, see `fake_ports`.'
+    devices = {} # Port name: simulated device, set by `fake_ports`
+
+    def __init__(self, port=None, baudrate=9600, timeout=None, **kwargs):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.is_open = False
+        self.dtr = True
+        self.buf = bytearray()
+        self.writes = []
+        for key, val in kwargs.items():
+            setattr(self, key, val)
+
+    def open(self):
+        if self.port not in self.devices:
+            raise serial.SerialException('No device on %s' % self.port)
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+
+    def reset_input_buffer(self):
+        self.buf.clear()
+
+    @property
+    def in_waiting(self):
+        return len(self.buf)
+
+    def write(self, data):
+        device = self.devices.get(self.port)
+        if device is None:
+            raise serial.SerialException('%s disconnected' % self.port)
+        self.writes.append(bytes(data))
+        reply = device.respond(bytes(data))
+        delays = getattr(device, 'delays', None)
+        delay = delays.pop(0) if delays else getattr(device, 'delay', 0)
+        if delay:
+            # Reply arrives later, e.g. slow pump
+            threading.Timer(delay, self.buf.extend, (reply,)).start()
+        else:
+            self.buf += reply
+        return len(data)
+
+    def _wait(self, ready):
+        'Wait up to `timeout` for `ready()`, as data arrives.'
+        deadline = time.monotonic() + (self.timeout or 0)
+        while not ready() and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    def read(self, size=1):
+        self._wait(lambda: len(self.buf) >= size)
+        out = bytes(self.buf[:size])
+        del self.buf[:size]
+        return out
+
+    def read_until(self, expected=b'\n', size=None):
+        self._wait(lambda: expected in self.buf)
+        end = (self.buf.index(expected) + len(expected)
+               if expected in self.buf else len(self.buf))
+        out = bytes(self.buf[:end])
+        del self.buf[:end]
+        return out
+
+
+class FakeFETbox(object):
+    'Simulated FETbox, acknowledges all commands. `reply` overrides replies.'
+    def __init__(self, mod_id=3, analog=None):
+        self.mod_id = mod_id
+        self.analog = analog or {} # Pin number: reading
+        self.reply = None # E.g. b'!\n', sent for any command
+        self.drop = 0 # Writes left unanswered, e.g. lost replies
+
+    def respond(self, data):
+        if self.drop:
+            self.drop -= 1
+            return b''
+        if self.reply is not None:
+            return self.reply
+        out = b''
+        for cmd in re.findall(rb'@[^\n]*\n', data):
+            if cmd == b'@#\n':
+                out += b'fetbox%i\n' % self.mod_id
+            elif cmd[1:2] == b'A':
+                out += b'%i\r\n' % self.analog.get(int(cmd[2:4]), 0)
+            elif cmd[1:2] == b'D':
+                out += b'1\r\n'
+            else:
+                out += b'*\r\n'
+        return out
+
+
+class FakeRegloDigital(object):
+    'Simulated Reglo Digital pump on address `addr`, see `FakeRegloICC` delays.'
+    def __init__(self, addr=1):
+        self.addr = str(addr).encode()
+        self.delays = []
+        self.delay = 0
+        self.running = False
+        self.flow = 1.2
+
+    def respond(self, data):
+        out = b''
+        for cmd in data.split(b'\r'):
+            if cmd[:1] != self.addr:
+                continue
+            body = cmd[1:]
+            if body == b'#':
+                out += b'REGLO Digital 1.0\r\n'
+            elif body == b'E':
+                out += b'+' if self.running else b'-'
+            elif body in (b'H', b'I'):
+                self.running = body == b'H'
+                out += b'*'
+            elif body == b'f':
+                out += b'%.2fmL/min\r\n' % self.flow
+            elif body.startswith(b'f'):
+                self.flow = int(body[1:5]) * 10**int(body[5:])
+                out += b'%.3f\r\n' % self.flow
+            else:
+                out += b'*'
+        return out
+
+
+class FakeRegloICC(object):
+    '''
+    Simulated 4-channel Reglo ICC pump. `delays` holds reply delays
+    (seconds) for the next writes, e.g. to reply after a read timed out,
+    `delay` applies to any further writes.
+    '''
+    def __init__(self, addr=1):
+        self.addr = str(addr).encode()
+        self.delays = []
+        self.delay = 0
+        self.running = {}
+        self.ccw = {}
+        self.flow = {}
+
+    def respond(self, data):
+        out = b''
+        for cmd in data.split(b'\r'):
+            match = re.match(rb'(\d)(\D+)(.*)$', cmd)
+            if not match:
+                continue
+            addr, op, arg = match.groups()
+            key = addr if arg else b'pump'
+            if op == b'#':
+                if addr == self.addr:
+                    out += b'REGLO ICC 0208 123\r\n'
+            elif op == b'?':
+                out += b'35.0 ml/min\r\n'
+            elif op == b'xD':
+                out += (b'K' if self.ccw.get(key) else b'J') + b'\r\n'
+            elif op == b'E':
+                out += b'+' if self.running.get(key) else b'-'
+            elif op in (b'H', b'I'):
+                self.running[key] = op == b'H'
+                out += b'*'
+            elif op in (b'J', b'K'):
+                self.ccw[key] = op == b'K'
+                out += b'*'
+            elif op == b'f' and not arg:
+                out += b'%.3f ml/min\r\n' % self.flow.get(addr, 1000.0)
+            elif op == b'f':
+                self.flow[addr] = int(arg[:4]) * 10**int(arg[4:])
+                out += b'%s\r\n' % arg
+            else:
+                out += b'*'
+        return out
+
+
+@pytest.fixture
+def fake_ports(monkeypatch):
+    '''
+    Replace `serial.Serial` with `FakeSerial`. Returns the port name to
+    simulated device dict, register devices before opening their port.
+    '''
+    devices = {}
+    monkeypatch.setattr(FakeSerial, 'devices', devices)
+    monkeypatch.setattr(serial, 'Serial', FakeSerial)
+    return devices
@@ -0,0 +1,86 @@
+from threading import Event
+import time
+
+import pytest
+
+from plateflo import fetbox as fetbox_mod
+from plateflo.fetbox import CMDS, FETbox
+
+from conftest import FakeFETbox
+
+
+@pytest.fixture
+def fetbox(fake_ports):
+    fake_ports['COM1'] = FakeFETbox(analog={14: 512, 15: 1023})
+    fetbox = FETbox('COM1')
+    fetbox.mod_ser.ser.writes.clear() # Drop ID validation
+    yield fetbox
+    fetbox.kill()
+
+
+def test_batch_single_command(fetbox):
+    with fetbox.batch() as results:
+        fetbox.enable_chan(1)
+    assert results == [True]
+    assert fetbox.mod_ser.ser.writes == [b'@H1\n'] # Not resent on its own
+
+
+def test_batch_several_commands(fetbox):
+    with fetbox.batch() as results:
+        fetbox.enable_chan(1)
+        fetbox.disable_chan(2)
+        fetbox.pwm_chan(3, 128)
+    assert results == [True, True, True]
+    assert fetbox.mod_ser.ser.writes == [b'@H1\n@I2\n@S3128\n']
+
+
+def test_analog_read_batch_single_pin(fetbox):
+    assert fetbox.analog_read_batch(['A0']) == [512]
+
+
+def test_analog_read_batch(fetbox):
+    assert fetbox.analog_read_batch(['A0', 'A9', 'A1']) == [512, None, 1023]
+
+
+def test_scan_expected_returns_early(fake_ports, monkeypatch):
+    fake_ports['COM1'] = FakeFETbox()
+    release = Event()
+    probe = fetbox_mod._probe_port
+    def _probe(port, baud):
+        if port == 'COM2':
+            release.wait(5) # Slow, unresponsive port
+            return None
+        return probe(port, baud)
+    monkeypatch.setattr(fetbox_mod, '_candidate_ports', lambda: ['COM1', 'COM2'])
+    monkeypatch.setattr(fetbox_mod, '_probe_port', _probe)
+    try:
+        start = time.monotonic()
+        assert fetbox_mod.scan_for_fetbox(force=True, expected=1) == [
+            {'port': 'COM1', 'id': 3}]
+        assert time.monotonic() - start < 2 # Not held up by COM2
+    finally:
+        release.set()
+
+
+def test_error_reply_digital_read(fetbox, fake_ports):
+    fake_ports['COM1'].reply = b'!\n'
+    assert fetbox.digital_read(2) is None
+
+
+def test_error_reply_query_ID(fetbox, fake_ports):
+    assert fetbox.query_ID() == 3
+    fake_ports['COM1'].reply = b'!\n'
+    assert fetbox.query_ID() is None
+
+
+def test_query_retried_after_timeout(fetbox, fake_ports):
+    fake_ports['COM1'].drop = 1 # First reply lost
+    assert fetbox.digital_read(2) == 1
+    assert fetbox.mod_ser.ser.writes == [b'@D02\n', b'@D02\n']
+
+
+def test_public_templates_take_padded_strings(fetbox):
+    assert CMDS['pwm'] % (3, '064') == '@S3064\n'
+    assert CMDS['hithold'] % (3, '064') == '@V3064\n'
+    fetbox.pwm_chan_fast(3, 64)
+    assert fetbox.mod_ser.ser.writes == [b'@S3064\n']
@@ -0,0 +1,59 @@
+import pytest
+
+from plateflo.ismatec.ismatec_dig import _flow_bytes
+from plateflo.ismatec.ismatec_icc import RegloICC
+
+from conftest import FakeRegloICC
+
+
+def _old_flow_string(value):
+    '''Flow string formatting used before `_flow_bytes`.'''
+    flow_string = format(value, "09.2E")
+    flow_string = flow_string.replace("E", '').replace('.', '')
+    return (flow_string[:5]+flow_string[6:]).encode()
+
+
+TIES = [0.125, 0.0625, 1.125, 2.675, 1.055, 1.005, 9.995, 99.95, 0.9995,
+        12.25, 12.35, 101.5, 0.1005]
+
+
+@pytest.mark.parametrize('flow', [0.0, 12.2, -12.2, -0.125, -999.0] + TIES)
+def test_digital_flow_matches_old(flow):
+    assert _flow_bytes(flow/100) == _old_flow_string(flow/100)
+
+
+@pytest.mark.parametrize('value', TIES + [-t for t in TIES])
+def test_ties_match_old(value):
+    assert _flow_bytes(value) == _old_flow_string(value)
+
+
+def test_digital_flow_range_matches_old():
+    for i in range(1, 100000):
+        for flow in (i/1000, i/100, i*0.001):
+            assert _flow_bytes(flow/100) == _old_flow_string(flow/100), flow
+
+
+def test_examples():
+    assert _flow_bytes(12.2/100) == b'0122-1'
+    assert _flow_bytes(0) == b'0000+0'
+    assert _flow_bytes(-12.2/100) == b'-122-1'
+
+
+@pytest.mark.parametrize('flow', [0.0, 12.2, -12.2, -0.125, 35.0] + TIES)
+def test_icc_flow_matches_old(flow):
+    assert _flow_bytes(flow*10) == _old_flow_string(flow*10)
+
+
+def test_icc_flow_range_matches_old():
+    for i in range(1, 100000):
+        for flow in (i/1000, i/100, i*0.001):
+            assert _flow_bytes(flow*10) == _old_flow_string(flow*10), flow
+
+
+def test_icc_flow_cmd(fake_ports):
+    fake_ports['COM5'] = FakeRegloICC()
+    pump = RegloICC('COM5', 1, timeout=0.3)
+    try:
+        assert pump._format_flow_cmd(12.2, b'1f') == (b'1f0122+2\r', 12.2)
+    finally:
+        pump.kill()
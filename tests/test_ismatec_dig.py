@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+from threading import Thread
+
+import pytest
+
+from plateflo.ismatec import ismatec_dig
+from plateflo.ismatec.ismatec_dig import RegloDigital
+
+from conftest import FakeRegloDigital
+
+
+def _call(func, timeout=5):
+    'Run `func` in a thread, failing the test if it does not return.'
+    result = []
+    thread = Thread(target=lambda: result.append(func()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), 'call hung'
+    return result[0]
+
+
+@pytest.fixture
+def pump(fake_ports):
+    fake_ports['COM2'] = FakeRegloDigital()
+    pump = RegloDigital('COM2', 1, poll_interval=None, timeout=0.05)
+    yield pump
+    pump.kill()
+
+
+def test_commands(pump):
+    assert pump.start() == 1
+    assert pump.get_run_state() == 1
+    assert pump.stop() == 1
+
+
+def test_status_timestamp_follows_wall_clock(pump, monkeypatch):
+    class SteppedDatetime(datetime): # Wall clock stepped, e.g. by NTP
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(days=1)
+    monkeypatch.setattr(ismatec_dig, 'datetime', SteppedDatetime)
+    before = SteppedDatetime.now()
+    pump.update_status()
+    assert before <= pump.status['timestamp'] <= SteppedDatetime.now()
+
+
+def test_status_age(fake_ports):
+    fake_ports['COM2'] = FakeRegloDigital()
+    pump = RegloDigital('COM2', 1, timeout=0.05, connect=False)
+    try:
+        assert pump.status_age() is None # No status yet
+        pump.update_status()
+        assert 0 <= pump.status_age() < 1
+    finally:
+        pump.kill()
+
+
+def test_commands_fail_fast_after_failed_reopen(pump, fake_ports):
+    pump.RETRY_BASE_DELAY = pump.RETRY_MAX_DELAY = 0.01
+    del fake_ports['COM2'] # Unplugged, reopens fail
+    _call(pump.update_status)
+    assert not pump.pump_ser.isOpen
+    assert pump.status['run_state'] == 'DISCONNECTED'
+    assert _call(pump.start) != 1 # Port left closed, no hang
+
+    fake_ports['COM2'] = FakeRegloDigital() # Plugged back in
+    assert _call(pump.start) == 1
+    assert pump.pump_ser.isOpen
+
+
+def test_no_background_polling_by_default(fake_ports):
+    fake_ports['COM2'] = FakeRegloDigital()
+    pump = RegloDigital('COM2', 1, timeout=0.05)
+    try:
+        assert pump._poller is None
+    finally:
+        pump.kill()
+
+
+def test_kill_with_poller_after_unplug(fake_ports):
+    fake_ports['COM2'] = FakeRegloDigital()
+    pump = RegloDigital('COM2', 1, poll_interval=0.1, timeout=0.05)
+    pump.RETRY_BASE_DELAY = pump.RETRY_MAX_DELAY = 0.01
+    del fake_ports['COM2'] # Poller now fails to reopen the port
+    _call(pump.kill)
+    assert not pump.pump_ser.isOpen
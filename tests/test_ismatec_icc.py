@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+from plateflo.ismatec.ismatec_icc import RegloICC
+
+from conftest import FakeRegloICC
+
+
+@pytest.fixture
+def pump(fake_ports):
+    fake_ports['COM5'] = FakeRegloICC()
+    pump = RegloICC('COM5', 1, timeout=0.3)
+    yield pump
+    pump.kill()
+
+
+def test_pass_fail_slow_first_reply(pump, fake_ports):
+    assert pump.stop() == 1 # Pending channel mode sent
+    fake_ports['COM5'].delays = [0.15] # Ack after FAST_TIMEOUT
+    assert pump.start() == 1
+    assert pump.pump_ser.timeout == 0.3 # Shared timeout left alone
+    time.sleep(0.2)
+    # Late ack discarded, not read as the following replies
+    assert pump.get_dir() == 1
+    assert pump.set_dir(-1) == 1
+    assert pump.get_dir() == -1
+
+
+def test_parse_flow_resp_no_reply():
+    assert RegloICC._parse_flow_resp(None, 12.2) == -1
+    assert RegloICC._parse_flow_resp(b'', 12.2) == -1
+    assert RegloICC._parse_flow_resp(b'12200\r', 12.2) == 12.2
+
+
+def test_status_plain_attribute(pump, fake_ports):
+    pump.status = {'timestamp': None} # Assignable, no serial I/O on read
+    assert pump.status == {'timestamp': None}
+    assert pump.start() == 1 # Stales the cached status
+    status = pump.get_status()
+    assert status is pump.status
+    assert status['timestamp'] is not None and 1 in status
@@ -0,0 +1,48 @@
+from plateflo import serial_io
+from plateflo.ismatec.ismatec_scanner import scan_for_pumps
+
+from conftest import FakeRegloDigital, FakeRegloICC
+
+
+def test_scan(fake_ports):
+    fake_ports['COM6'] = FakeRegloDigital(addr=2)
+    fake_ports['COM7'] = FakeRegloICC(addr=1)
+    fake_ports['COM8'] = FakeRegloDigital(addr=9) # No pump answers
+    assert scan_for_pumps(ports=['COM6', 'COM7', 'COM8']) == [
+        {'pump': 'Digital', 'port': 'COM6', 'addr': 2},
+        {'pump': 'ICC', 'port': 'COM7', 'addr': 1}]
+
+
+def test_scan_slow_identification(fake_ports):
+    pump = FakeRegloDigital(addr=2)
+    pump.delays = [0] # Answers the presence probe promptly
+    pump.delay = 0.05 # Slower to identify itself
+    fake_ports['COM6'] = pump
+    assert scan_for_pumps(ports=['COM6']) == [
+        {'pump': 'Digital', 'port': 'COM6', 'addr': 2}]
+
+
+def test_scan_slow_pump(fake_ports):
+    pump = FakeRegloICC(addr=3)
+    pump.delay = 0.05 # Every reply, presence probe included
+    fake_ports['COM6'] = pump
+    assert scan_for_pumps(ports=['COM6']) == [
+        {'pump': 'ICC', 'port': 'COM6', 'addr': 3}]
+
+
+def test_scan_open_device_keeps_timeout(fake_ports):
+    fake_ports['COM6'] = FakeRegloICC(addr=1)
+    device = serial_io.SerialDevice('COM6', timeout=0.5)
+    device.open()
+    seen = [] # Shared timeout at each probe, e.g. as seen by a pump driver
+    write_cmd = device.write_cmd
+    def _write_cmd(*args, **kwargs):
+        seen.append(device.timeout)
+        return write_cmd(*args, **kwargs)
+    device.write_cmd = _write_cmd
+    try:
+        assert scan_for_pumps(ports=[device]) == [
+            {'pump': 'ICC', 'port': 'COM6', 'addr': 1}]
+        assert seen and set(seen) == {0.5}
+    finally:
+        device.close()
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+from threading import Event, Timer
+import time
+
+import pytest
+
+from plateflo.scheduler import RecurringEvent, Scheduler, SingleEvent
+
+
+def _wait_for(cond, timeout=2):
+    'Poll `cond` until true, failing the test after `timeout` seconds.'
+    end = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < end, 'timed out'
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def sched():
+    sched = Scheduler()
+    yield sched
+    sched.stop()
+
+
+def test_equal_times_run_in_insertion_order(sched):
+    fired = []
+    due = datetime.now()
+    for i in range(5):
+        sched.add_event(SingleEvent(due, fired.append, args=(i,)))
+    for _ in range(5):
+        sched.monitor()
+    assert fired == [0, 1, 2, 3, 4]
+    assert [entry[0] for entry in sched.event_history] == [due]*5
+
+
+def test_remove_queued_event(sched):
+    later = datetime.now() + timedelta(hours=1)
+    keep = sched.add_event(SingleEvent(later, print))
+    gone = sched.add_event(SingleEvent(later - timedelta(minutes=1), print))
+    sched.remove_event(gone)
+    assert [entry[1] for entry in sched.events] == [keep] # Pruned from front
+    with pytest.raises(KeyError):
+        sched.remove_event(gone)
+
+
+def test_remove_after_compact(sched):
+    later = datetime.now() + timedelta(hours=1)
+    ids = [sched.add_event(SingleEvent(later + timedelta(seconds=i), print))
+           for i in range(30)]
+    for eventID in ids[1:-1]:
+        sched.remove_event(eventID)
+    assert len(sched.events) < 10 # Compacted, not 30 lazily removed entries
+    sched.remove_event(ids[-1]) # Kept through the compaction
+    assert list(sched._queued) == [ids[0]]
+    assert sched.events[0][1] == ids[0]
+    sched.remove_event(ids[0])
+    assert sched.events == []
+
+
+def test_start_stop(sched):
+    fired = Event()
+    sched.start()
+    sched.add_event(SingleEvent(datetime.now(), fired.set))
+    assert fired.wait(2)
+    sched.stop()
+    assert sched._thread is None
+    sched.start() # Restartable
+    fired.clear()
+    sched.add_event(SingleEvent(datetime.now(), fired.set))
+    assert fired.wait(2)
+
+
+def test_stop_from_task(sched):
+    stopped = Event()
+    def _stop():
+        sched.stop()
+        stopped.set()
+    sched.start()
+    thread = sched._thread
+    sched.add_event(SingleEvent(datetime.now(), _stop))
+    assert stopped.wait(2)
+    thread.join(2)
+    assert not thread.is_alive()
+
+
+def test_catch_up_past_start_time():
+    now = datetime.now()
+    start = now - timedelta(seconds=35)
+    event = RecurringEvent(timedelta(seconds=10), print, start_time=start)
+    assert event.dateTime == start + timedelta(seconds=40)
+
+
+def test_stop_time_ends_recurrance(sched):
+    fired = []
+    sched.add_event(RecurringEvent(
+        timedelta(seconds=0.05), lambda: fired.append(1),
+        stop_time=datetime.now() + timedelta(seconds=0.2)))
+    sched.start()
+    time.sleep(0.5)
+    assert 1 <= len(fired) <= 4
+    assert not sched.events and not sched._queued
+
+
+def test_remove_while_task_running(sched):
+    running, release = Event(), Event()
+    def _task():
+        running.set()
+        release.wait(2)
+    eventID = sched.add_event(RecurringEvent(timedelta(seconds=0.05), _task))
+    sched.start()
+    assert running.wait(2)
+    sched.remove_event(eventID) # No KeyError while popped
+    release.set()
+    time.sleep(0.2)
+    assert eventID not in sched._queued # Not rescheduled
+    _wait_for(lambda: not sched._in_flight)
+
+
+def test_sleep_until_next_unbounded(sched):
+    sched.add_event(SingleEvent(datetime.now() + timedelta(seconds=0.1), print))
+    start = time.monotonic()
+    sched.sleep_until_next(max_sleep=None)
+    assert 0.05 < time.monotonic() - start < 1
+    sched.monitor()
+    assert not sched.events
+    later = datetime.now() + timedelta(hours=1)
+    Timer(0.1, sched.add_event, (SingleEvent(later, print),)).start()
+    start = time.monotonic()
+    sched.sleep_until_next(max_sleep=None) # Empty queue, woken by add_event
+    assert time.monotonic() - start < 1
+
+
+def test_history_keeps_fired_times(sched):
+    event = RecurringEvent(timedelta(seconds=0.05), print)
+    sched.add_event(event)
+    _wait_for(lambda: sched.monitor() or len(sched.event_history) >= 2)
+    first, second = sched.event_history[:2]
+    assert first[0] < second[0] <= event.dateTime
+    assert first[3] is second[3] is event # Live, rescheduled in place
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from plateflo import serial_io
+
+from conftest import FakeRegloDigital
+
+
+@pytest.fixture
+def device(fake_ports):
+    fake_ports['COM4'] = FakeRegloDigital()
+    device = serial_io.SerialDevice('COM4', timeout=0.05)
+    device.open()
+    yield device
+    if device.isOpen:
+        device.close()
+
+
+def test_write_cmd(device):
+    assert device.write_cmd('1#\r', EOL='\n') == {
+        'resp': 'REGLO Digital 1.0\r', 'cmd': '1#\r'}
+    assert device.write_cmd(b'1E\r', rsp_len=1, raw=True) == {
+        'resp': b'-', 'cmd': b'1E\r'}
+
+
+def test_rsp_count_returns_list(device):
+    assert device.write_cmd(b'1#\r', EOL='\n', rsp_count=1,
+                            raw=True)['resp'] == [b'REGLO Digital 1.0\r']
+    assert device.write_cmd(b'1#\r1#\r', EOL='\n', rsp_count=2,
+                            raw=True)['resp'] == [b'REGLO Digital 1.0\r'] * 2
+
+
+def test_closed_port_fails_fast(device):
+    device.close()
+    assert device.write_cmd('1#\r', EOL='\n') == {
+        'resp': '', 'cmd': '1#\r', 'error': True}
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_dead_cmd_thread_response_wait_bounded(device, monkeypatch):
+    def write(data):
+        raise RuntimeError('unexpected')
+    monkeypatch.setattr(device.ser, 'write', write)
+    monkeypatch.setattr(device, 'RESPONSE_WAIT_MARGIN', 0.1)
+    start = time.monotonic()
+    rsp = device.write_cmd('1#\r', EOL='\n')
+    assert rsp == {'resp': '', 'cmd': '1#\r', 'error': True}
+    assert time.monotonic() - start < 1.0
+    assert not device._pending
+
+
+def test_late_reply_to_short_timeout_discarded(device, fake_ports):
+    device.timeout = 0.3
+    fake_ports['COM4'].delays = [0.1] # Reply after the 0.05s read
+    assert device.write_cmd(b'1H\r', 1, raw=True, timeout=0.05)['resp'] == b''
+    assert device.timeout == 0.3
+    assert device.write_cmd(b'1I\r', 1, raw=True)['resp'] == b'*'
+    assert device.write_cmd(b'1E\r', 1, raw=True)['resp'] == b'-' # In sync